@@ -0,0 +1,51 @@
+"""Benchmark the diary page parser engines against saved diary pages.
+
+Parses every fixture in ``benchmarks/fixtures/diary_page_*.html`` with each engine,
+checks that both return identical films and page counts, and reports throughput.
+
+Usage:
+    uv run python benchmarks/bench_diary_parser.py [--repeat 20]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from letterboxd2notion.parsers.html_parser import _parse_diary_html
+
+FIXTURES = Path(__file__).parent / "fixtures"
+ENGINES = ("bs4", "lxml")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = [path.read_bytes() for path in sorted(FIXTURES.glob("diary_page_*.html"))]
+    if not pages:
+        raise SystemExit(f"No fixtures found in {FIXTURES}")
+
+    reference = [_parse_diary_html(page, engine="bs4") for page in pages]
+    for engine in ENGINES:
+        if [_parse_diary_html(page, engine=engine) for page in pages] != reference:
+            raise SystemExit(f"Engine {engine!r} does not match the bs4 parser")
+
+    rows = sum(len(films) for films, _ in reference)
+    print(f"{len(pages)} pages, {rows} rows, {args.repeat} repeats")
+
+    for engine in ENGINES:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for page in pages:
+                _parse_diary_html(page, engine=engine)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{engine:<5} time={elapsed:6.2f} s  "
+            f"rows/s={rows * args.repeat / elapsed:10,.0f}  "
+            f"ms/page={elapsed / (len(pages) * args.repeat) * 1000:6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
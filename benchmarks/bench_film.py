@@ -0,0 +1,136 @@
+"""Benchmark the per-film model work of a sync: validation, copies, dumps, properties.
+
+Builds synthetic films and times each step a film goes through between the parser
+and Notion, reporting time and peak allocations per batch. Timings are taken with
+tracemalloc off; allocations in a second, traced run. Steps that were optimized are
+timed against the code they replaced ("old"), with the speedup.
+
+Usage:
+    uv run python benchmarks/bench_film.py [--films 10000]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+from letterboxd2notion.journal import SyncJournal
+from letterboxd2notion.models import FILM_LIST, Film
+
+ENRICHMENT = {
+    "tmdb_id": 603,
+    "backdrop_url": "https://image.tmdb.org/t/p/w1280/backdrop.jpg",
+    "poster_url": "https://image.tmdb.org/t/p/w500/poster.jpg",
+}
+
+
+def film_values(n: int) -> dict[str, Any]:
+    return {
+        "letterboxd_id": f"letterboxd-viewing-{100000 + n}",
+        "tmdb_id": None,
+        "title": f"Synthetic Film {n}",
+        "year": 1950 + n % 70,
+        "letterboxd_url": f"https://letterboxd.com/film/synthetic-film-{n}/",
+        "rating": None if n % 11 == 0 else (n % 10 + 1) / 2,
+        "watched_date": date(2025, 1, 1) - timedelta(days=n // 3),
+        "rewatch": n % 5 == 0,
+        "review": f"Review of film {n}. " * (n % 4) or None,
+    }
+
+
+def old_rating_stars(film: Film) -> str:
+    """``Film.rating_stars`` as it was, building the string on every dump."""
+    if film.rating is None:
+        return ""
+    return "\u2605" * int(film.rating) + ("\u00bd" if film.rating % 1 >= 0.5 else "")
+
+
+def measure(name: str, count: int, run: Callable[[], Any], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(
+        f"  {name:<32} time={best * 1000:8.1f} ms  us/film={best / count * 1e6:6.2f}  "
+        f"peak={peak / 1e6:6.2f} MB"
+    )
+    return best
+
+
+def compare(name: str, count: int, old: Callable[[], Any], new: Callable[[], Any]) -> None:
+    """Time the code a step used to run against what it runs now."""
+    before = measure(f"{name} (old)", count, old)
+    after = measure(name, count, new)
+    print(f"  {'':<32} {before / after:.1f}x faster")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--films", type=int, default=10_000)
+    args = parser.parse_args()
+
+    values = [film_values(n) for n in range(args.films)]
+    films = [Film(**v) for v in values]
+    enriched = [film.model_copy(update=ENRICHMENT) for film in films]
+    print(f"{args.films} films")
+
+    measure("validate", args.films, lambda: [Film(**v) for v in values])
+    measure(
+        "enrich (model_copy)",
+        args.films,
+        lambda: [f.model_copy(update=ENRICHMENT) for f in films],
+    )
+    measure("model_dump", args.films, lambda: [f.model_dump() for f in enriched])
+    compare(
+        "rating_stars",
+        args.films,
+        lambda: [old_rating_stars(f) for f in enriched],
+        lambda: [f.rating_stars for f in enriched],
+    )
+    # A sync builds each film's properties once; before caching, every further
+    # read (e.g. re-creating a page whose update found it archived) built them again
+    compare(
+        "notion properties reread",
+        args.films,
+        lambda: [f._build_notion_properties() for f in enriched],
+        lambda: [f.to_notion_properties() for f in enriched],
+    )
+
+    # A diary page's worth of films at a time, as the journal stores them
+    pages = [films[i : i + 50] for i in range(0, len(films), 50)]
+
+    def old_round_trip() -> None:
+        for page_films in pages:
+            films_json = json.dumps([f.model_dump(mode="json") for f in page_films])
+            [Film.model_validate(f) for f in json.loads(films_json)]
+
+    def new_round_trip() -> None:
+        for page_films in pages:
+            FILM_LIST.validate_json(FILM_LIST.dump_json(page_films))
+
+    compare("journal page json", args.films, old_round_trip, new_round_trip)
+
+    journal = SyncJournal(Path(":memory:"), "bench")
+    journal.start()
+
+    def journal_round_trip() -> None:
+        for page, page_films in enumerate(pages):
+            journal.record_page(page, page_films, len(pages))
+            journal.page(page)
+
+    measure("journal page round trip", args.films, journal_round_trip)
+    journal.close()
+
+
+if __name__ == "__main__":
+    main()
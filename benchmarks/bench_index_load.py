@@ -0,0 +1,211 @@
+"""Benchmark the Notion index load with and without property projection.
+
+Serves a synthetic database of realistic page objects through an httpx mock
+transport and runs the real ``NotionSync._load_existing_pages`` against it.
+
+Usage:
+    uv run python benchmarks/bench_index_load.py [--pages 10000]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import Any
+
+import httpx
+
+from letterboxd2notion.notion.client import NotionClient
+from letterboxd2notion.notion.schema import SCHEMA
+from letterboxd2notion.notion.sync import NotionSync
+
+PAGE_SIZE = 100
+
+
+def _rich_text(content: str, segments: int = 1) -> list[dict[str, Any]]:
+    size = max(1, len(content) // segments)
+    return [
+        {
+            "type": "text",
+            "text": {"content": content[i : i + size], "link": None},
+            "annotations": {
+                "bold": False,
+                "italic": False,
+                "strikethrough": False,
+                "underline": False,
+                "code": False,
+                "color": "default",
+            },
+            "plain_text": content[i : i + size],
+            "href": None,
+        }
+        for i in range(0, len(content), size)
+    ]
+
+
+def synthetic_page(n: int) -> dict[str, Any]:
+    """A page object shaped like Notion's, with schema and user-added columns."""
+    properties = {
+        "Title": {"id": "title", "type": "title", "title": _rich_text(f"Film {n}")},
+        "Rating": {"id": "rat", "type": "number", "number": (n % 10 + 1) / 2},
+        "Film Year": {"id": "yr", "type": "number", "number": 1950 + n % 70},
+        "Watched Date": {
+            "id": "wd",
+            "type": "date",
+            "date": {"start": "2024-05-01", "end": None, "time_zone": None},
+        },
+        "Review": {"id": "rev", "type": "rich_text", "rich_text": _rich_text("review " * 60)},
+        "Movie URL": {"id": "url", "type": "url", "url": f"https://letterboxd.com/film/f-{n}/"},
+        "Backdrop": {
+            "id": "bd",
+            "type": "files",
+            "files": [
+                {
+                    "name": f"Film {n}",
+                    "type": "external",
+                    "external": {"url": f"https://image.tmdb.org/t/p/w1280/{n}.jpg"},
+                }
+            ],
+        },
+        "Letterboxd ID": {
+            "id": "lbid",
+            "type": "rich_text",
+            "rich_text": _rich_text(f"letterboxd-review-{n}"),
+        },
+        "TMDB ID": {"id": "tmdb", "type": "number", "number": 1000 + n},
+        "Rewatch": {"id": "rw", "type": "checkbox", "checkbox": n % 7 == 0},
+        # Columns users typically add by hand
+        "Notes": {"id": "nts", "type": "rich_text", "rich_text": _rich_text("note " * 300, 8)},
+        "Tags": {
+            "id": "tags",
+            "type": "multi_select",
+            "multi_select": [
+                {"id": f"opt-{i}", "name": f"tag {i}", "color": "blue"} for i in range(4)
+            ],
+        },
+        "Watched With": {
+            "id": "rel",
+            "type": "relation",
+            "relation": [{"id": f"00000000-0000-0000-0000-{i:012d}"} for i in range(6)],
+            "has_more": False,
+        },
+        "Poster": {
+            "id": "pst",
+            "type": "files",
+            "files": [
+                {
+                    "name": "poster.jpg",
+                    "type": "file",
+                    "file": {
+                        "url": "https://prod-files-secure.s3.us-west-2.amazonaws.com/" + "x" * 300,
+                        "expiry_time": "2026-01-01T00:00:00.000Z",
+                    },
+                }
+            ],
+        },
+    }
+    user = {"object": "user", "id": "11111111-1111-1111-1111-111111111111"}
+    return {
+        "object": "page",
+        "id": f"{n:08d}-0000-0000-0000-000000000000",
+        "created_time": "2024-05-01T00:00:00.000Z",
+        "last_edited_time": "2024-05-02T00:00:00.000Z",
+        "created_by": user,
+        "last_edited_by": user,
+        "cover": None,
+        "icon": None,
+        "parent": {"type": "database_id", "database_id": "db"},
+        "archived": False,
+        "in_trash": False,
+        "properties": properties,
+        "url": f"https://www.notion.so/Film-{n}",
+        "public_url": None,
+    }
+
+
+def build_responses(total: int) -> tuple[list[bytes], list[bytes], dict[str, Any]]:
+    """Pre-serialize full and projected query responses, plus the database object."""
+    full: list[bytes] = []
+    projected: list[bytes] = []
+    sample = synthetic_page(0)["properties"]
+    schema_ids = {sample[name]["id"] for name in SCHEMA}
+
+    for start in range(0, total, PAGE_SIZE):
+        pages = [synthetic_page(n) for n in range(start, min(total, start + PAGE_SIZE))]
+        has_more = start + PAGE_SIZE < total
+        envelope = {
+            "object": "list",
+            "has_more": has_more,
+            "next_cursor": str(start + PAGE_SIZE) if has_more else None,
+        }
+        full.append(json.dumps({**envelope, "results": pages}).encode())
+        for page in pages:
+            page["properties"] = {
+                name: prop for name, prop in page["properties"].items() if prop["id"] in schema_ids
+            }
+        projected.append(json.dumps({**envelope, "results": pages}).encode())
+
+    database = {"object": "database", "properties": sample}
+    return full, projected, database
+
+
+async def measure(
+    label: str,
+    full: list[bytes],
+    projected: list[bytes],
+    database: dict[str, Any],
+    project: bool,
+) -> None:
+    """Run the index load against pre-built responses and report its cost."""
+    received = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal received
+        if request.method == "GET":
+            return httpx.Response(200, json=database)
+        # Like Notion, only project when the client asks for it
+        responses = projected if request.url.params.get_list("filter_properties") else full
+        cursor = json.loads(request.content).get("start_cursor")
+        body = responses[int(cursor or 0) // PAGE_SIZE]
+        received += len(body)
+        return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+
+    async with NotionClient(
+        "token", rate_limit_delay=1e-6, burst=1000, transport=httpx.MockTransport(handler)
+    ) as notion:
+        filter_properties = None
+        if project:
+            filter_properties = await NotionSync(notion, "db")._schema_property_ids()
+
+        # Time and memory are measured in separate runs; tracemalloc skews timings
+        start = time.perf_counter()
+        entries = await NotionSync(notion, "db")._load_existing_pages(
+            filter_properties=filter_properties
+        )
+        elapsed = time.perf_counter() - start
+        transferred = received
+
+        tracemalloc.start()
+        await NotionSync(notion, "db")._load_existing_pages(filter_properties=filter_properties)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(
+        f"{label:<10} pages={len(entries):>6}  bytes={transferred / 1e6:8.1f} MB  "
+        f"time={elapsed:6.2f} s  peak={peak / 1e6:7.1f} MB"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10_000)
+    args = parser.parse_args()
+
+    full, projected, database = build_responses(args.pages)
+    await measure("full", full, projected, database, project=False)
+    await measure("projected", full, projected, database, project=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
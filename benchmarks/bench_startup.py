@@ -0,0 +1,84 @@
+"""Check CLI startup against an import-time budget.
+
+Runs ``python -m letterboxd2notion --help`` (or another command line) under
+``-X importtime`` a few times and adds up the time spent importing the package,
+i.e. everything after the interpreter's own startup. Fails if the fastest run is
+over budget, or if any module that only sync work needs was imported.
+
+Usage:
+    uv run python benchmarks/bench_startup.py [--budget-ms 60] [-- sync --help]
+"""
+
+import argparse
+import subprocess
+import sys
+
+# Only commands that talk to the services need these; --help must not load them
+HEAVY_MODULES = (
+    "asyncio",
+    "httpx",
+    "pydantic",
+    "pydantic_settings",
+    "bs4",
+    "h2",
+    "lxml",
+    "sqlite3",
+)
+
+
+def import_times(args: list[str]) -> list[tuple[str, int, bool]]:
+    """(module, cumulative microseconds, is top-level) for each import of a run."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "letterboxd2notion", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        # Nesting is shown by indentation; top-level names follow a single space
+        imports.append((name.strip(), int(cumulative), not name.startswith("  ")))
+    return imports
+
+
+def package_import_ms(imports: list[tuple[str, int, bool]]) -> float:
+    """Milliseconds spent importing after the interpreter's own startup."""
+    # Top-level imports before the package's own (site, encodings) are interpreter
+    # startup; the ones after it are made by the package or while running the command
+    top = [(name, cumulative) for name, cumulative, top_level in imports if top_level]
+    first = next(i for i, (name, _) in enumerate(top) if name.startswith("letterboxd2notion"))
+    return sum(cumulative for _, cumulative in top[first:]) / 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=60.0)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("command", nargs="*", default=["--help"])
+    args = parser.parse_args()
+
+    best = float("inf")
+    for _ in range(args.runs):
+        imports = import_times(args.command)
+        best = min(best, package_import_ms(imports))
+
+    roots = sorted({name.split(".")[0] for name, _, _ in imports} & set(HEAVY_MODULES))
+    print(f"letterboxd2notion {' '.join(args.command)}")
+    print(f"  import time  {best:6.1f} ms  (budget {args.budget_ms:.0f} ms)")
+    print(f"  heavy modules  {', '.join(roots) or 'none'}")
+
+    failed = False
+    if best > args.budget_ms:
+        print(f"FAIL: imports took {best:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if roots and "--help" in args.command:
+        print(f"FAIL: help imported {', '.join(roots)}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Benchmark every sync stage offline against local Letterboxd/TMDB/Notion stand-ins.
+
+Runs the real parsers, ``enrich_film_with_tmdb``, ``NotionClient`` and ``NotionSync``
+against the fake services in ``fakes.py``, and reports wall time, requests/sec and
+peak traced memory per stage. Peak memory includes what the fake services allocate
+during the stage (e.g. Notion pages they store); pass ``--no-memory`` for timings
+without tracemalloc overhead.
+
+Usage:
+    uv run python benchmarks/bench_sync.py [--entries 1000 10000] [--latency 0.02]
+        [--throttle 0.02] [--no-memory]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import httpx
+from fakes import DATABASE_ID, DIARY_URL, RSS_URL, FakeServices
+
+from letterboxd2notion.models import Film
+from letterboxd2notion.notion.client import NotionClient
+from letterboxd2notion.notion.sync import NotionSync
+from letterboxd2notion.parsers import enrich_film_with_tmdb, enrich_films
+from letterboxd2notion.parsers.cache import ReviewCache
+from letterboxd2notion.parsers.html_parser import (
+    fetch_reviews,
+    iter_diary_films,
+    parse_all_diary_pages,
+)
+from letterboxd2notion.parsers.rss_parser import parse_rss_feed
+from letterboxd2notion.pipeline import run_pipeline
+from letterboxd2notion.ratelimit import TokenBucket
+
+# Rate limits well above what the fakes can serve, so the code under test is measured
+UNLIMITED = 1e6
+CONCURRENCY = 8
+
+
+def _notion(fakes: FakeServices) -> NotionClient:
+    return NotionClient(
+        "token",
+        rate_limit_delay=1 / UNLIMITED,
+        burst=CONCURRENCY,
+        transport=fakes.transport(),
+    )
+
+
+async def _stage(
+    name: str,
+    fakes: FakeServices,
+    run: Callable[[], Awaitable[Any]],
+    memory: bool,
+) -> Any:
+    """Run one stage and print its cost."""
+    before = sum(fakes.requests.values())
+    throttled_before = sum(fakes.throttled.values())
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = await run()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if memory else 0
+    if memory:
+        tracemalloc.stop()
+
+    requests = sum(fakes.requests.values()) - before
+    throttled = sum(fakes.throttled.values()) - throttled_before
+    print(
+        f"  {name:<14} time={elapsed:7.2f} s  requests={requests:>7} ({throttled} throttled)  "
+        f"req/s={requests / elapsed:9,.0f}" + (f"  peak={peak / 1e6:7.1f} MB" if memory else "")
+    )
+    return result
+
+
+async def bench(entries: int, latency: float, throttle: float, memory: bool) -> None:
+    print(f"{entries} entries, latency={latency * 1000:.0f} ms, throttle={throttle:.0%}")
+
+    # Half the diary is already in Notion: the index load and updates have work to do
+    fakes = FakeServices(entries, existing=entries // 2, latency=latency, throttle=throttle)
+    async with httpx.AsyncClient(transport=fakes.transport()) as client:
+        letterboxd = TokenBucket(UNLIMITED, capacity=CONCURRENCY)
+        tmdb = TokenBucket(UNLIMITED, capacity=CONCURRENCY)
+
+        await _stage("rss parse", fakes, lambda: parse_rss_feed(client, RSS_URL), memory)
+        films: list[Film] = await _stage(
+            "diary scrape",
+            fakes,
+            lambda: parse_all_diary_pages(
+                client, DIARY_URL, concurrency=CONCURRENCY, limiter=letterboxd
+            ),
+            memory,
+        )
+        # The second pass finds every review in the cache
+        review_cache = ReviewCache()
+        scraped = films
+        for name in ("review fetch", "review cached"):
+            films = await _stage(
+                name,
+                fakes,
+                lambda: fetch_reviews(client, scraped, letterboxd, review_cache, CONCURRENCY),
+                memory,
+            )
+        review_cache.close()
+        enriched: list[Film] = await _stage(
+            "tmdb enrich",
+            fakes,
+            lambda: enrich_films(client, films, "key", limiter=tmdb, concurrency=CONCURRENCY),
+            memory,
+        )
+
+        async with _notion(fakes) as notion:
+            sync = NotionSync(notion, DATABASE_ID)
+            await _stage("notion index", fakes, sync.initialize, memory)
+            await _stage(
+                "notion write",
+                fakes,
+                lambda: sync.sync_films(enriched, concurrency=CONCURRENCY),
+                memory,
+            )
+
+    # End to end through the streaming pipeline, on fresh fakes: as for the stages above,
+    # half the entries already have a page, so the run mixes creates with updates and skips
+    fakes = FakeServices(entries, existing=entries // 2, latency=latency, throttle=throttle)
+    async with httpx.AsyncClient(transport=fakes.transport()) as client, _notion(fakes) as notion:
+        sync = NotionSync(notion, DATABASE_ID)
+        await sync.initialize()
+        tmdb = TokenBucket(UNLIMITED, capacity=CONCURRENCY)
+
+        async def enrich(film: Film) -> Film:
+            return await enrich_film_with_tmdb(client, film, "key", limiter=tmdb)
+
+        async def write(film: Film) -> str:
+            return (await sync.sync_film(film))[1]
+
+        source = iter_diary_films(
+            client,
+            DIARY_URL,
+            concurrency=CONCURRENCY,
+            limiter=TokenBucket(UNLIMITED, capacity=CONCURRENCY),
+            reviews=True,
+        )
+        await _stage(
+            "pipeline",
+            fakes,
+            lambda: run_pipeline(source, enrich, write, CONCURRENCY, CONCURRENCY),
+            memory,
+        )
+    print()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[1_000])
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per request")
+    parser.add_argument("--throttle", type=float, default=0.0, help="Share of requests 429'd")
+    parser.add_argument("--no-memory", dest="memory", action="store_false")
+    args = parser.parse_args()
+
+    for entries in args.entries:
+        await bench(entries, args.latency, args.throttle, args.memory)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
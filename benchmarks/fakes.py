@@ -0,0 +1,363 @@
+"""Local stand-ins for Letterboxd, TMDB and Notion behind one httpx mock transport.
+
+Synthetic data is generated on the fly from an entry number, so only the Notion
+pages written during a run are kept in memory. Every request can be delayed by a
+fixed latency and a share of them answered with ``429 Too Many Requests``.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import uuid
+from collections import Counter
+from datetime import date, timedelta
+from typing import Any
+from xml.sax.saxutils import escape
+
+import httpx
+
+from letterboxd2notion.notion.schema import SCHEMA
+
+USERNAME = "benchmark"
+DATABASE_ID = "bench-db"
+DIARY_URL = f"https://letterboxd.com/{USERNAME}/films/diary"
+RSS_URL = f"https://letterboxd.com/{USERNAME}/rss/"
+ROWS_PER_PAGE = 50
+NOTION_PAGE_SIZE = 100
+
+_DIARY_PAGE_RE = re.compile(r"/films/diary/page/(\d+)/$")
+_REVIEW_RE = re.compile(rf"/{USERNAME}/film/synthetic-film-(\d+)/$")
+_TMDB_MOVIE_RE = re.compile(r"/3/movie/(\d+)$")
+_NOTION_PAGE_RE = re.compile(r"/v1/pages/([\w-]+)$")
+
+# Property IDs as Notion would report them for the schema
+_PROPERTY_IDS = {name: f"p{i}" for i, name in enumerate(SCHEMA)}
+
+
+def entry_title(n: int) -> str:
+    return f"Synthetic Film {n}"
+
+
+def entry_year(n: int) -> int:
+    return 1950 + n % 70
+
+
+def entry_watched(n: int) -> date:
+    # Entry 0 is the most recent
+    return date(2025, 1, 1) - timedelta(days=n // 3)
+
+
+def entry_rating(n: int) -> int | None:
+    """Rating in half-stars, or None for unrated entries."""
+    return None if n % 11 == 0 else n % 10 + 1
+
+
+def entry_has_review(n: int) -> bool:
+    return n % 4 == 0
+
+
+def _review_paragraphs(n: int) -> str:
+    return f"<p>Review of film {n}, paragraph one &amp; more.</p><p>Paragraph two.</p>"
+
+
+def _diary_row(n: int) -> str:
+    slug = f"synthetic-film-{n}"
+    watched = entry_watched(n)
+    half_stars = entry_rating(n)
+    rating = (
+        f'<span class="rating rated-{half_stars}">{"★" * (half_stars // 2)}</span>'
+        if half_stars
+        else '<span class="rating"></span>'
+    )
+    rewatch = "" if n % 5 == 0 else " icon-status-off"
+    review = (
+        f'<a href="/{USERNAME}/film/{slug}/" class="has-icon icon-review icon-16 tooltip" '
+        'title="View review">Review</a>'
+        if entry_has_review(n)
+        else ""
+    )
+    return (
+        f'<tr class="diary-entry-row viewing-poster-container" data-viewing-id="{100000 + n}">'
+        f'<td class="col-daydate"><a class="daydate" href="/{USERNAME}/films/diary/for/'
+        f'{watched:%Y/%m/%d}/">{watched.day}</a></td>'
+        f'<td class="col-production"><div class="react-component poster film-poster" '
+        f'data-item-name="{entry_title(n)} ({entry_year(n)})" data-item-slug="{slug}" '
+        f'data-item-link="/film/{slug}/"><div><img src="/empty-poster-35.png" alt="" '
+        f'width="35" height="52"/></div></div><h2 class="name -primary prettify">'
+        f'<a href="/{USERNAME}/film/{slug}/">{entry_title(n)}</a></h2></td>'
+        f'<td class="col-releaseyear"><span>{entry_year(n)}</span></td>'
+        f'<td class="col-rating -center"><div class="hide-for-owner">{rating}</div></td>'
+        f'<td class="col-like -center"><span class="has-icon icon-16 icon-liked"></span></td>'
+        f'<td class="col-rewatch -center icon-rewatch{rewatch}"><span class="has-icon"></span></td>'
+        f'<td class="col-review -center">{review}</td></tr>'
+    )
+
+
+def diary_page(page: int, entries: int) -> bytes:
+    """HTML of a diary page, with pagination like Letterboxd's."""
+    start = (page - 1) * ROWS_PER_PAGE
+    rows = "\n".join(_diary_row(n) for n in range(start, min(entries, start + ROWS_PER_PAGE)))
+    last = max(1, -(-entries // ROWS_PER_PAGE))
+    links = "".join(
+        f'<li class="paginate-page"><a href="/{USERNAME}/films/diary/page/{p}/">{p}</a></li>'
+        for p in sorted({1, 2, 3, last})
+        if p <= last
+    )
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Diary</title>'
+        '</head><body class="diary"><div id="content"><table class="table film-table">'
+        f"<tbody>\n{rows}\n</tbody></table>"
+        f'<div class="pagination"><div class="paginate-pages"><ul>{links}</ul></div></div>'
+        "</div></body></html>"
+    ).encode()
+
+
+def rss_feed(entries: int) -> bytes:
+    """RSS XML with one item per entry."""
+    items = []
+    for n in range(entries):
+        half_stars = entry_rating(n)
+        rating = (
+            f"<letterboxd:memberRating>{half_stars / 2}</letterboxd:memberRating>"
+            if half_stars
+            else ""
+        )
+        review = escape(
+            '<p><img src="https://a.ltrbxd.com/poster.jpg"/></p>' + _review_paragraphs(n)
+        )
+        items.append(
+            f"<item><title>{entry_title(n)}, {entry_year(n)}</title>"
+            f"<link>https://letterboxd.com/{USERNAME}/film/synthetic-film-{n}/</link>"
+            f'<guid isPermaLink="false">letterboxd-review-{100000 + n}</guid>'
+            f"<letterboxd:watchedDate>{entry_watched(n)}</letterboxd:watchedDate>"
+            f"<letterboxd:rewatch>{'Yes' if n % 5 == 0 else 'No'}</letterboxd:rewatch>"
+            f"<letterboxd:filmTitle>{entry_title(n)}</letterboxd:filmTitle>"
+            f"<letterboxd:filmYear>{entry_year(n)}</letterboxd:filmYear>{rating}"
+            f"<tmdb:movieId>{10000 + n}</tmdb:movieId>"
+            f"<description>{review}</description></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0" '
+        'xmlns:letterboxd="https://letterboxd.com" xmlns:tmdb="https://themoviedb.org" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/"><channel>'
+        f"<title>Letterboxd - {USERNAME}</title>{''.join(items)}</channel></rss>"
+    ).encode()
+
+
+def review_page(n: int) -> bytes:
+    """HTML of the review page of an entry, with the review as in the RSS feed."""
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Review</title>'
+        '</head><body class="review"><div id="content"><section class="viewing">'
+        '<div class="review body-text -prose -hero prettify"><div>'
+        f"{_review_paragraphs(n)}</div></div></section></div></body></html>"
+    ).encode()
+
+
+def tmdb_movie(tmdb_id: int) -> dict[str, Any]:
+    """TMDB movie object (trimmed to a realistic subset of fields)."""
+    return {
+        "id": tmdb_id,
+        "title": f"Movie {tmdb_id}",
+        "backdrop_path": f"/backdrop-{tmdb_id}.jpg",
+        "poster_path": f"/poster-{tmdb_id}.jpg",
+        "overview": "An overview. " * 20,
+        "genre_ids": [18, 80],
+        "popularity": 12.5,
+        "vote_average": 7.1,
+    }
+
+
+def _notion_value(value: dict[str, Any]) -> dict[str, Any]:
+    """Expand a property value as sent into the richer shape Notion returns."""
+    prop_type, raw = next(iter(value.items()))
+    if prop_type in ("title", "rich_text"):
+        raw = [
+            {
+                "type": "text",
+                "text": {"content": item["text"]["content"], "link": None},
+                "annotations": {"bold": False, "italic": False, "color": "default"},
+                "plain_text": item["text"]["content"],
+                "href": None,
+            }
+            for item in raw
+        ]
+    elif prop_type == "date":
+        raw = {"start": raw["start"], "end": None, "time_zone": None}
+    elif prop_type == "files":
+        raw = [{"name": f["name"], "type": "external", "external": f["external"]} for f in raw]
+    return {"type": prop_type, prop_type: raw}
+
+
+class FakeServices:
+    """Letterboxd, TMDB and Notion served from synthetic data.
+
+    Args:
+        entries: Diary size
+        existing: How many of the entries (newest first) already have a Notion page
+        latency: Seconds added to every request
+        throttle: Share of requests answered with 429
+        retry_after: ``Retry-After`` sent with each 429, in seconds
+        seed: Seed for the throttling decisions
+        validators: Send ETags with Letterboxd responses and answer matching
+            conditional requests with ``304 Not Modified``
+    """
+
+    def __init__(
+        self,
+        entries: int,
+        existing: int = 0,
+        latency: float = 0.0,
+        throttle: float = 0.0,
+        retry_after: float = 0.01,
+        seed: int = 0,
+        validators: bool = False,
+    ):
+        self.entries = entries
+        self.validators = validators
+        self.latency = latency
+        self.throttle = throttle
+        self.retry_after = retry_after
+        self.requests: Counter[str] = Counter()
+        self.throttled: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._pages: dict[str, dict[str, Any]] = {}
+        for n in range(existing):
+            self._store(str(uuid.UUID(int=n)), self._existing_properties(n))
+
+    def transport(self) -> httpx.MockTransport:
+        """Transport routing requests to the fake services by host."""
+        return httpx.MockTransport(self.handle)
+
+    @property
+    def notion_pages(self) -> int:
+        return len(self._pages)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        service = request.url.host.split(".")[-2]  # letterboxd / themoviedb / notion
+        self.requests[service] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.throttle and self._random.random() < self.throttle:
+            self.throttled[service] += 1
+            return httpx.Response(429, headers={"Retry-After": str(self.retry_after)})
+
+        if service == "letterboxd":
+            response = self._letterboxd(request)
+            if self.validators and response.status_code == 200:
+                etag = f'"{hashlib.sha1(response.content).hexdigest()}"'
+                if request.headers.get("If-None-Match") == etag:
+                    return httpx.Response(304, headers={"ETag": etag})
+                response.headers["ETag"] = etag
+            return response
+        if service == "themoviedb":
+            return self._tmdb(request)
+        return self._notion(request)
+
+    def _letterboxd(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == f"/{USERNAME}/rss/":
+            return httpx.Response(200, content=rss_feed(self.entries))
+        if match := _REVIEW_RE.search(request.url.path):
+            n = int(match.group(1))
+            if not entry_has_review(n):
+                return httpx.Response(404)
+            return httpx.Response(200, content=review_page(n))
+        match = _DIARY_PAGE_RE.search(request.url.path)
+        if match is None:
+            return httpx.Response(404)
+        page = int(match.group(1))
+        if (page - 1) * ROWS_PER_PAGE >= self.entries:
+            return httpx.Response(200, content=b"<html><body></body></html>")
+        return httpx.Response(200, content=diary_page(page, self.entries))
+
+    def _tmdb(self, request: httpx.Request) -> httpx.Response:
+        if match := _TMDB_MOVIE_RE.search(request.url.path):
+            return httpx.Response(200, json=tmdb_movie(int(match.group(1))))
+        # Search: derive a stable ID from the query
+        query = request.url.params.get("query", "")
+        tmdb_id = 10000 + int(query.rsplit(" ", 1)[-1]) if query[-1:].isdigit() else 1
+        return httpx.Response(200, json={"page": 1, "results": [tmdb_movie(tmdb_id)]})
+
+    def _existing_properties(self, n: int) -> dict[str, Any]:
+        half_stars = entry_rating(n)
+        properties: dict[str, Any] = {
+            "Title": {"title": [{"text": {"content": entry_title(n)}}]},
+            "Letterboxd ID": {
+                "rich_text": [{"text": {"content": f"letterboxd-viewing-{100000 + n}"}}]
+            },
+            "Film Year": {"number": entry_year(n)},
+            "Movie URL": {"url": f"https://letterboxd.com/film/synthetic-film-{n}/"},
+            "Watched Date": {"date": {"start": entry_watched(n).isoformat()}},
+            "Rewatch": {"checkbox": n % 5 == 0},
+        }
+        if half_stars:
+            properties["Rating"] = {"number": half_stars / 2}
+        return properties
+
+    def _store(self, page_id: str, properties: dict[str, Any]) -> dict[str, Any]:
+        page = self._pages.setdefault(
+            page_id,
+            {"object": "page", "id": page_id, "archived": False, "properties": {}},
+        )
+        for name, value in properties.items():
+            page["properties"][name] = {"id": _PROPERTY_IDS.get(name, name), **_notion_value(value)}
+        page["last_edited_time"] = "2025-01-01T00:00:00.000Z"
+        return page
+
+    def _notion(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == "GET" and path == f"/v1/databases/{DATABASE_ID}":
+            properties = {
+                name: {"id": _PROPERTY_IDS[name], "name": name, "type": next(iter(config))}
+                for name, config in SCHEMA.items()
+            }
+            return httpx.Response(200, json={"object": "database", "properties": properties})
+
+        if request.method == "POST" and path == f"/v1/databases/{DATABASE_ID}/query":
+            body = json.loads(request.content)
+            ids = list(self._pages)
+            start = int(body.get("start_cursor") or 0)
+            size = body.get("page_size", NOTION_PAGE_SIZE)
+            has_more = start + size < len(ids)
+            wanted = set(request.url.params.get_list("filter_properties"))
+            results = []
+            for page_id in ids[start : start + size]:
+                page = self._pages[page_id]
+                if wanted:
+                    page = {
+                        **page,
+                        "properties": {
+                            name: prop
+                            for name, prop in page["properties"].items()
+                            if prop["id"] in wanted
+                        },
+                    }
+                results.append(page)
+            return httpx.Response(
+                200,
+                json={
+                    "object": "list",
+                    "results": results,
+                    "has_more": has_more,
+                    "next_cursor": str(start + size) if has_more else None,
+                },
+            )
+
+        if request.method == "POST" and path == "/v1/pages":
+            body = json.loads(request.content)
+            page = self._store(str(uuid.uuid4()), body["properties"])
+            return httpx.Response(200, json=page)
+
+        if request.method == "PATCH" and (match := _NOTION_PAGE_RE.search(path)):
+            if match.group(1) not in self._pages:
+                return httpx.Response(404, json={"message": "page not found"})
+            body = json.loads(request.content)
+            if body.get("archived"):
+                # Archived pages drop out of database queries
+                page = self._pages.pop(match.group(1))
+                return httpx.Response(200, json={**page, "archived": True})
+            return httpx.Response(200, json=self._store(match.group(1), body["properties"]))
+
+        return httpx.Response(404, json={"message": f"unhandled {request.method} {path}"})
@@ -1,12 +1,31 @@
-"""CLI commands using click."""
+"""CLI commands using click.
 
-import asyncio
-from typing import Any
+Everything beyond click is imported inside the commands that use it, so ``--help``
+and each subcommand only load what they need (``make check-startup`` guards this).
+"""
+
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
 
 from letterboxd2notion import __version__
-from letterboxd2notion.config import Settings, get_settings
+
+if TYPE_CHECKING:
+    import httpx
+
+    from letterboxd2notion.config import Settings
+    from letterboxd2notion.journal import SyncJournal
+    from letterboxd2notion.models import Film
+    from letterboxd2notion.notion.client import NotionClient
+    from letterboxd2notion.notion.sync import NotionSync
+    from letterboxd2notion.parsers.cache import HTTPCache, ReviewCache, TMDBCache
+    from letterboxd2notion.ratelimit import TokenBucket
+    from letterboxd2notion.state import SyncState
 
 
 @click.group()
@@ -15,126 +34,1054 @@ from letterboxd2notion.config import Settings, get_settings
 def main(ctx: click.Context) -> None:
     """Sync Letterboxd diary to Notion database."""
     ctx.ensure_object(dict)
-    try:
-        ctx.obj["settings"] = get_settings()
-    except Exception as e:
-        # Settings will fail if .env is missing - allow check commands to run
-        ctx.obj["settings"] = None
-        ctx.obj["settings_error"] = str(e)
+
+
+def _settings(ctx: click.Context) -> "Settings | None":
+    """Load the settings on first use, or None if they can't be loaded.
+
+    Settings will fail if .env is missing - commands that can run without them
+    decide what to do instead.
+    """
+    if "settings" not in ctx.obj:
+        from letterboxd2notion.config import get_settings
+
+        try:
+            ctx.obj["settings"] = get_settings()
+        except Exception as e:
+            ctx.obj["settings"] = None
+            ctx.obj["settings_error"] = str(e)
+    return ctx.obj["settings"]
+
+
+def _require_settings(ctx: click.Context) -> "Settings":
+    """Load the settings, exiting with the error if they can't be loaded."""
+    settings = _settings(ctx)
+    if settings is None:
+        click.echo(f"Error loading settings: {ctx.obj['settings_error']}", err=True)
+        ctx.exit(1)
+    return settings
+
+
+def _notion_client(settings: "Settings") -> "NotionClient":
+    """Build a NotionClient driven by the configured rate limits."""
+    from letterboxd2notion.notion.client import NotionClient
+
+    return NotionClient(
+        settings.notion_token,
+        rate_limit_delay=settings.rate_limit_delay,
+        burst=settings.rate_limit_burst,
+        max_retries=settings.max_retries,
+    )
 
 
 @main.command()
 @click.option("--full", is_flag=True, help="Full sync using HTML scraping")
+@click.option("--incremental", is_flag=True, help="Scrape the diary back to synced entries only")
 @click.option("--dry-run", is_flag=True, help="Show what would be synced without syncing")
 @click.option("--limit", type=int, help="Limit number of films to sync")
+@click.option("--concurrency", type=int, help="Max in-flight Notion writes (default: settings)")
+@click.option("--rebuild-index", is_flag=True, help="Rescan Notion, ignoring the index cache")
+@click.option("--force", is_flag=True, help="Sync even if the RSS feed is unchanged")
+@click.option("--resume", is_flag=True, help="Continue an interrupted --full sync")
+@click.option(
+    "--metrics-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Write run metrics (JSON and Prometheus textfile) here (default: METRICS_DIR)",
+)
 @click.pass_context
-def sync(ctx: click.Context, full: bool, dry_run: bool, limit: int | None) -> None:
+def sync(
+    ctx: click.Context,
+    full: bool,
+    incremental: bool,
+    dry_run: bool,
+    limit: int | None,
+    concurrency: int | None,
+    rebuild_index: bool,
+    force: bool,
+    resume: bool,
+    metrics_dir: Path | None,
+) -> None:
     """Sync films from Letterboxd to Notion.
 
     By default, uses RSS feed for incremental sync (~50 most recent).
-    Use --full for complete history sync via HTML scraping.
+    Use --full for complete history sync via HTML scraping, or --incremental
+    to scrape the diary only back to the entries already in Notion.
     """
-    settings: Settings | None = ctx.obj.get("settings")
+    import asyncio
+
+    settings = _require_settings(ctx)
+    if full and incremental:
+        raise click.UsageError("--full and --incremental can't be combined")
+    if resume and not full:
+        raise click.UsageError("--resume only applies to --full syncs")
+
+    asyncio.run(
+        _sync(
+            settings,
+            full=full,
+            dry_run=dry_run,
+            limit=limit,
+            concurrency=concurrency or settings.notion_concurrency,
+            incremental=incremental,
+            rebuild_index=rebuild_index,
+            force=force,
+            resume=resume,
+            metrics_dir=metrics_dir or settings.metrics_dir,
+        )
+    )
+
+
+@main.command("sync-all")
+@click.option(
+    "--targets",
+    "targets_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="TOML file listing the targets (default: TARGETS_FILE)",
+)
+@click.option("--full", is_flag=True, help="Full sync using HTML scraping")
+@click.option("--incremental", is_flag=True, help="Scrape the diary back to synced entries only")
+@click.option("--limit", type=int, help="Limit number of films to sync per target")
+@click.option("--rebuild-index", is_flag=True, help="Rescan Notion, ignoring the index cache")
+@click.option("--force", is_flag=True, help="Sync even if the RSS feed is unchanged")
+@click.option("--resume", is_flag=True, help="Continue interrupted --full syncs")
+@click.option("--parallel", type=int, help="Targets synced at once (default: settings)")
+@click.option(
+    "--metrics-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Write run metrics (JSON and Prometheus textfile) here (default: METRICS_DIR)",
+)
+@click.pass_context
+def sync_all(
+    ctx: click.Context,
+    targets_file: Path | None,
+    full: bool,
+    incremental: bool,
+    limit: int | None,
+    rebuild_index: bool,
+    force: bool,
+    resume: bool,
+    parallel: int | None,
+    metrics_dir: Path | None,
+) -> None:
+    """Sync every target in a targets file, concurrently in one process.
+
+    Each [[targets]] entry names a Letterboxd username, a Notion database ID and
+    optionally the Notion token to use (token, or token_env naming an environment
+    variable; default TOKEN_V3). HTTP connections and the TMDB cache are shared
+    between targets; Notion rate limits apply per integration token.
+    """
+    import asyncio
+
+    from pydantic import ValidationError
+
+    from letterboxd2notion.config import Settings, load_targets
+
+    settings = _settings(ctx)
     if settings is None:
-        click.echo(f"Error loading settings: {ctx.obj.get('settings_error')}", err=True)
+        # Targets bring their own Notion token and database
+        try:
+            settings = Settings(TOKEN_V3="", DATABASE_ID="")
+        except ValidationError:
+            click.echo(f"Error loading settings: {ctx.obj['settings_error']}", err=True)
+            ctx.exit(1)
+    if full and incremental:
+        raise click.UsageError("--full and --incremental can't be combined")
+    if resume and not full:
+        raise click.UsageError("--resume only applies to --full syncs")
+    targets_file = targets_file or settings.targets_file
+    if targets_file is None:
+        raise click.UsageError("Pass --targets or set TARGETS_FILE")
+
+    try:
+        targets = {
+            target.name: settings.for_target(target) for target in load_targets(targets_file)
+        }
+    except ValueError as e:
+        click.echo(f"Error loading targets: {e}", err=True)
+        ctx.exit(1)
+
+    failed = asyncio.run(
+        _sync_all(
+            settings,
+            targets,
+            full=full,
+            limit=limit,
+            rebuild_index=rebuild_index,
+            force=force,
+            incremental=incremental,
+            resume=resume,
+            parallel=parallel or settings.target_concurrency,
+            metrics_dir=metrics_dir or settings.metrics_dir,
+        )
+    )
+    if failed:
+        ctx.exit(1)
+
+
+async def _sync_all(
+    settings: "Settings",
+    targets: dict[str, "Settings"],
+    full: bool,
+    limit: int | None,
+    rebuild_index: bool,
+    force: bool,
+    incremental: bool,
+    resume: bool,
+    parallel: int,
+    metrics_dir: Path | None,
+) -> int:
+    """Sync the targets (settings by target name) concurrently, at most ``parallel`` at a time.
+
+    A failing target doesn't stop the others.
+
+    Returns:
+        Number of targets that failed
+    """
+    import asyncio
+
+    from letterboxd2notion import metrics
+
+    click.echo(f"Syncing {len(targets)} targets, {parallel} at a time")
+    recorder = metrics.reset()
+    semaphore = asyncio.Semaphore(parallel)
+    failures: list[str] = []
+
+    async def sync_target(shared: _SharedClients, name: str, target: "Settings") -> None:
+        echo = _prefixed_echo(name)
+        async with semaphore:
+            try:
+                await _sync_films(
+                    shared,
+                    target,
+                    full=full,
+                    dry_run=False,
+                    limit=limit,
+                    concurrency=target.notion_concurrency,
+                    rebuild_index=rebuild_index,
+                    force=force,
+                    incremental=incremental,
+                    resume=resume,
+                    echo=echo,
+                )
+            except Exception as e:
+                echo(f"Sync failed: {e!r}", err=True)
+                failures.append(name)
+
+    try:
+        async with (
+            _SharedClients.open(settings, targets=min(parallel, len(targets))) as shared,
+            asyncio.TaskGroup() as tg,
+        ):
+            tmdb = shared.tmdb_cache
+            reviews = shared.review_cache
+            for name, target in targets.items():
+                tg.create_task(sync_target(shared, name, target))
+    finally:
+        recorder.finish(not failures)
+        if metrics_dir is not None:
+            json_path, prom_path = recorder.write(metrics_dir)
+            click.echo(f"Metrics written to {json_path} and {prom_path}")
+
+    click.echo(f"\nTMDB: {tmdb.misses} requests, {tmdb.hits} cache hits")
+    if reviews.misses or reviews.hits:
+        click.echo(f"Reviews: {reviews.misses} fetched, {reviews.hits} cached")
+    click.echo(f"{len(targets) - len(failures)} of {len(targets)} targets synced")
+    for name in failures:
+        click.echo(f"  Failed: {name}", err=True)
+    return len(failures)
+
+
+def _prefixed_echo(prefix: str) -> Callable[..., None]:
+    """``click.echo`` tagging every line with ``prefix``, for interleaved output."""
+
+    def echo(message: str = "", err: bool = False) -> None:
+        click.echo(
+            "\n".join(f"[{prefix}] {line}" if line else line for line in message.split("\n")),
+            err=err,
+        )
+
+    return echo
+
+
+@main.command()
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Minutes between polls (default: settings)",
+)
+@click.option(
+    "--jitter",
+    type=click.FloatRange(0, 1),
+    help="Random spread of the interval, as a fraction of it (default: settings)",
+)
+@click.option("--concurrency", type=int, help="Max in-flight Notion writes (default: settings)")
+@click.option(
+    "--metrics-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Write metrics of each poll here (default: METRICS_DIR)",
+)
+@click.pass_context
+def watch(
+    ctx: click.Context,
+    interval: float | None,
+    jitter: float | None,
+    concurrency: int | None,
+    metrics_dir: Path | None,
+) -> None:
+    """Keep running, syncing new diary entries from the RSS feed as they appear.
+
+    The feed is polled every --interval minutes, give or take --jitter. The Notion
+    index, TMDB data and feed validators stay in memory between polls, so a poll
+    with nothing new makes a single conditional request. SIGTERM or Ctrl-C stops
+    after the current poll's writes finish; a second signal stops right away.
+    """
+    import asyncio
+
+    settings = _require_settings(ctx)
+    try:
+        asyncio.run(
+            _watch(
+                settings,
+                interval=interval or settings.watch_interval_minutes,
+                jitter=settings.watch_jitter if jitter is None else jitter,
+                concurrency=concurrency or settings.notion_concurrency,
+                metrics_dir=metrics_dir or settings.metrics_dir,
+            )
+        )
+    except asyncio.CancelledError:
+        click.echo("Stopped", err=True)
         ctx.exit(1)
 
-    asyncio.run(_sync(settings, full=full, dry_run=dry_run, limit=limit))
+
+async def _watch(
+    settings: "Settings",
+    interval: float,
+    jitter: float,
+    concurrency: int,
+    metrics_dir: Path | None,
+) -> None:
+    """Poll the RSS feed until a stop signal, syncing whatever is new each time."""
+    import asyncio
+    import contextlib
+    import random
+    import signal
+    import time
+    from datetime import datetime
+
+    from letterboxd2notion import metrics
+    from letterboxd2notion.exceptions import NotModifiedError
+    from letterboxd2notion.notion.sync import NotionSync
+    from letterboxd2notion.parsers.cache import HTTPCache
+    from letterboxd2notion.parsers.rss_parser import iter_rss_feed
+    from letterboxd2notion.pipeline import primed
+    from letterboxd2notion.state import SyncState
+
+    stop = asyncio.Event()
+    main_task = asyncio.current_task()
+
+    def request_stop() -> None:
+        if stop.is_set() and main_task is not None:
+            main_task.cancel()
+            return
+        click.echo("\nStopping after the current poll (signal again to stop now)...")
+        stop.set()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        # Not available on Windows, where Ctrl-C still raises KeyboardInterrupt
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, request_stop)
+
+    max_age = timedelta(days=settings.index_max_age_days)
+    state = SyncState(settings.sync_state_path, settings.notion_database_id, max_age=max_age)
+    http_cache = HTTPCache(settings.http_cache_path)
+    click.echo(
+        f"Watching {settings.letterboxd_rss_url} every {interval:g} minutes (+/- {jitter:.0%})"
+    )
+    try:
+        async with (
+            _SharedClients.open(settings) as shared,
+            shared.notion(settings.notion_token) as notion,
+        ):
+            sync_client: NotionSync | None = None
+            indexed_at = 0.0
+
+            async def poll() -> None:
+                nonlocal sync_client, indexed_at
+                recorder = metrics.recorder()
+                source = iter_rss_feed(
+                    shared.letterboxd_http, settings.letterboxd_rss_url, cache=http_cache
+                )
+                try:
+                    source = await primed(source)
+                except NotModifiedError:
+                    click.echo("  No new entries")
+                    return
+
+                # Load the index once, then only merge in pages edited since; rescan it
+                # as often as the index cache would be
+                with recorder.stage("index"):
+                    if (
+                        sync_client is None
+                        or time.monotonic() - indexed_at > max_age.total_seconds()
+                    ):
+                        sync_client = NotionSync(notion, settings.notion_database_id, state=state)
+                        await sync_client.initialize()
+                        indexed_at = time.monotonic()
+                    else:
+                        await sync_client.refresh_index()
+
+                counts = await _sync_source(
+                    shared,
+                    sync_client,
+                    source,
+                    settings,
+                    concurrency=concurrency,
+                    limit=None,
+                    echo=click.echo,
+                )
+                http_cache.commit()
+                recorder.observe_films(counts)
+                click.echo(
+                    f"  {counts['created']} created, {counts['updated']} updated, "
+                    f"{counts['skipped']} skipped (unchanged)"
+                )
+
+            while not stop.is_set():
+                click.echo(f"\n[{datetime.now():%Y-%m-%d %H:%M:%S}] Checking the RSS feed...")
+                recorder = metrics.reset()
+                success = False
+                try:
+                    await poll()
+                    success = True
+                except Exception as e:
+                    # Keep the validators of the failed poll from hiding its entries next time
+                    http_cache.discard()
+                    click.echo(f"  Poll failed: {e!r}", err=True)
+                finally:
+                    recorder.finish(success)
+                    if metrics_dir is not None:
+                        recorder.write(metrics_dir)
+
+                delay = interval * 60 * random.uniform(1 - jitter, 1 + jitter)
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(stop.wait(), delay)
+    finally:
+        http_cache.close()
+        state.close()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            with contextlib.suppress(NotImplementedError):
+                loop.remove_signal_handler(sig)
 
 
 async def _sync(
-    settings: Settings,
+    settings: "Settings",
     full: bool,
     dry_run: bool,
     limit: int | None,
+    concurrency: int = 1,
+    rebuild_index: bool = False,
+    force: bool = False,
+    incremental: bool = False,
+    resume: bool = False,
+    metrics_dir: Path | None = None,
 ) -> None:
     """Async sync implementation."""
-    import httpx
+    from letterboxd2notion import metrics
 
-    from letterboxd2notion.notion.client import NotionClient
+    click.echo(f"Syncing for user: {settings.letterboxd_username}")
+
+    recorder = metrics.reset()
+    success = False
+    try:
+        async with _SharedClients.open(settings) as shared:
+            await _sync_films(
+                shared,
+                settings,
+                full=full,
+                dry_run=dry_run,
+                limit=limit,
+                concurrency=concurrency,
+                rebuild_index=rebuild_index,
+                force=force,
+                incremental=incremental,
+                resume=resume,
+            )
+            tmdb = shared.tmdb_cache
+            if tmdb.misses or tmdb.hits:
+                click.echo(f"TMDB: {tmdb.misses} requests, {tmdb.hits} cache hits")
+            reviews = shared.review_cache
+            if reviews.misses or reviews.hits:
+                click.echo(f"Reviews: {reviews.misses} fetched, {reviews.hits} cached")
+        success = True
+    finally:
+        recorder.finish(success)
+        if metrics_dir is not None:
+            json_path, prom_path = recorder.write(metrics_dir)
+            click.echo(f"Metrics written to {json_path} and {prom_path}")
+
+
+@dataclass
+class _SharedClients:
+    """Connection pools, the TMDB cache and rate limiters shared by every target.
+
+    Each service gets one client (see ``transport``), with a pool sized for the
+    concurrency of all targets. Letterboxd and TMDB limit by client IP, so each
+    gets one limiter for the whole process; Notion limits per integration token,
+    so targets syncing with the same token share a limiter and the others don't
+    wait on it.
+    """
+
+    settings: "Settings"
+    letterboxd_http: "httpx.AsyncClient"
+    tmdb_http: "httpx.AsyncClient"
+    notion_http: "httpx.AsyncClient"
+    tmdb_cache: "TMDBCache"
+    review_cache: "ReviewCache"
+    letterboxd_limiter: "TokenBucket"
+    tmdb_limiter: "TokenBucket"
+    notion_limiters: dict[str, "TokenBucket"] = field(default_factory=dict)
+
+    @classmethod
+    @asynccontextmanager
+    async def open(cls, settings: "Settings", targets: int = 1) -> "AsyncIterator[_SharedClients]":
+        from letterboxd2notion.parsers.cache import ReviewCache, TMDBCache
+        from letterboxd2notion.ratelimit import TokenBucket
+        from letterboxd2notion.transport import create_client
+
+        def client(service: str, concurrency: int) -> "httpx.AsyncClient":
+            return create_client(service, concurrency * targets, http2=settings.http2)
+
+        tmdb_cache = TMDBCache(
+            settings.tmdb_cache_path,
+            ttl=timedelta(days=settings.tmdb_cache_ttl_days),
+        )
+        review_cache = ReviewCache(
+            settings.review_cache_path,
+            ttl=timedelta(days=settings.review_cache_ttl_days),
+        )
+        try:
+            async with (
+                client("letterboxd", settings.letterboxd_concurrency) as letterboxd_http,
+                client("tmdb", settings.tmdb_concurrency) as tmdb_http,
+                client("notion", settings.notion_concurrency) as notion_http,
+            ):
+                yield cls(
+                    settings,
+                    letterboxd_http,
+                    tmdb_http,
+                    notion_http,
+                    tmdb_cache,
+                    review_cache,
+                    letterboxd_limiter=TokenBucket(settings.letterboxd_rate_limit),
+                    tmdb_limiter=TokenBucket(
+                        settings.tmdb_rate_limit, capacity=settings.tmdb_concurrency
+                    ),
+                )
+        finally:
+            tmdb_cache.close()
+            review_cache.close()
+
+    def notion(self, token: str) -> "NotionClient":
+        """A Notion client on the shared pool, rate limited per integration token."""
+        from letterboxd2notion.notion.client import NotionClient
+        from letterboxd2notion.ratelimit import TokenBucket, rate_for_delay
+
+        settings = self.settings
+        limiter = self.notion_limiters.get(token)
+        if limiter is None:
+            limiter = TokenBucket(
+                rate_for_delay(settings.rate_limit_delay), capacity=settings.rate_limit_burst
+            )
+            self.notion_limiters[token] = limiter
+        return NotionClient(
+            token,
+            rate_limit_delay=settings.rate_limit_delay,
+            max_retries=settings.max_retries,
+            client=self.notion_http,
+            limiter=limiter,
+        )
+
+
+async def _sync_films(
+    shared: _SharedClients,
+    settings: "Settings",
+    full: bool,
+    dry_run: bool,
+    limit: int | None,
+    concurrency: int,
+    rebuild_index: bool,
+    force: bool,
+    incremental: bool,
+    resume: bool,
+    echo: Callable[..., None] = click.echo,
+) -> None:
+    """Stream films from Letterboxd through TMDB into Notion.
+
+    Letterboxd responses are cached per database and only committed once the whole
+    run succeeded. Full syncs keep a progress journal so an interrupted run can be
+    resumed.
+    """
+    from letterboxd2notion.parsers.cache import HTTPCache
+    from letterboxd2notion.state import SyncState
+
+    http_cache = HTTPCache(settings.http_cache_path)
+    state = SyncState(
+        settings.sync_state_path,
+        settings.notion_database_id,
+        max_age=timedelta(days=settings.index_max_age_days),
+    )
+    try:
+        await _stream_films(
+            shared,
+            http_cache,
+            state,
+            settings,
+            full=full,
+            dry_run=dry_run,
+            limit=limit,
+            concurrency=concurrency,
+            rebuild_index=rebuild_index,
+            force=force,
+            incremental=incremental,
+            resume=resume,
+            echo=echo,
+        )
+    finally:
+        http_cache.close()
+        state.close()
+
+
+async def _stream_films(
+    shared: _SharedClients,
+    http_cache: "HTTPCache",
+    state: "SyncState",
+    settings: "Settings",
+    full: bool,
+    dry_run: bool,
+    limit: int | None,
+    concurrency: int,
+    rebuild_index: bool,
+    force: bool,
+    incremental: bool,
+    resume: bool,
+    echo: Callable[..., None],
+) -> None:
+    """Body of ``_sync_films``, run with the target's HTTP cache and index state open."""
+    from letterboxd2notion import metrics
+    from letterboxd2notion.exceptions import NotModifiedError
+    from letterboxd2notion.journal import SyncJournal
     from letterboxd2notion.notion.sync import NotionSync
-    from letterboxd2notion.parsers import enrich_film_with_tmdb
-    from letterboxd2notion.parsers.html_parser import parse_all_diary_pages
-    from letterboxd2notion.parsers.rss_parser import parse_rss_feed
+    from letterboxd2notion.pipeline import primed
 
-    click.echo(f"Syncing for user: {settings.letterboxd_username}")
+    recorder = metrics.recorder()
+    # Opening the client makes no requests, so an unchanged feed still costs nothing
+    async with shared.notion(settings.notion_token) as notion:
+        sync_client = NotionSync(notion, settings.notion_database_id, state=state)
+
+        async def load_index() -> None:
+            echo("\nLoading Notion index...")
+            with recorder.stage("index"):
+                await sync_client.initialize(rebuild=rebuild_index)
+            echo(
+                f"Found {sync_client.existing_count} existing entries in database "
+                f"(index from {sync_client.index_source})"
+            )
 
-    async with httpx.AsyncClient() as http_client:
-        # Parse films
-        if full:
-            click.echo("Performing full sync via HTML scraping...")
-            films = await parse_all_diary_pages(
-                http_client,
+        # Films are produced lazily; pages are fetched as the sync consumes them
+        source: AsyncIterator[Film]
+        journal: SyncJournal | None = None
+        if incremental:
+            # The scrape stops at what the index already has, so load it first
+            from letterboxd2notion.parsers.html_parser import iter_new_diary_films
+
+            await load_index()
+            echo("\nPerforming incremental sync via HTML scraping...")
+            source = iter_new_diary_films(
+                shared.letterboxd_http,
                 settings.letterboxd_diary_url,
-                on_page=lambda p: click.echo(f"  Fetching page {p}..."),
+                sync_client.synced_viewing_ids(),
+                stop_streak=settings.incremental_stop_streak,
+                on_page=lambda p: echo(f"  Fetching page {p}..."),
+                limiter=shared.letterboxd_limiter,
+                cache=http_cache,
+                reviews=settings.fetch_reviews,
+                review_cache=shared.review_cache,
+                concurrency=settings.letterboxd_concurrency,
             )
-        else:
-            click.echo("Performing incremental sync via RSS feed...")
-            films = await parse_rss_feed(http_client, settings.letterboxd_rss_url)
+        elif full:
+            from letterboxd2notion.parsers.html_parser import iter_diary_films
 
-        click.echo(f"Found {len(films)} films")
+            echo("Performing full sync via HTML scraping...")
+            if not dry_run:
+                journal = SyncJournal(settings.journal_path, settings.notion_database_id)
+                if journal.start(resume=resume):
+                    done = journal.progress()
+                    echo(
+                        f"Resuming: {done['pages']} pages scraped, {done['enriched']} films "
+                        f"enriched, {done['written']} written"
+                    )
+                elif resume:
+                    echo("No interrupted sync to resume, starting from page 1")
+            source = iter_diary_films(
+                shared.letterboxd_http,
+                settings.letterboxd_diary_url,
+                on_page=lambda p: echo(f"  Fetching page {p}..."),
+                concurrency=settings.letterboxd_concurrency,
+                limiter=shared.letterboxd_limiter,
+                cache=http_cache,
+                journal=journal,
+                reviews=settings.fetch_reviews,
+                review_cache=shared.review_cache,
+            )
+        else:
+            from letterboxd2notion.parsers.rss_parser import iter_rss_feed
 
-        if limit:
-            films = films[:limit]
-            click.echo(f"Limited to {len(films)} films")
+            echo("Performing incremental sync via RSS feed...")
+            source = iter_rss_feed(
+                shared.letterboxd_http,
+                settings.letterboxd_rss_url,
+                cache=None if force else http_cache,
+            )
 
-        # Enrich with TMDB data
-        click.echo("Enriching with TMDB data...")
-        enriched_films = []
-        with click.progressbar(films, label="Fetching backdrops") as bar:
-            for film in bar:
-                try:
-                    enriched = await enrich_film_with_tmdb(http_client, film, settings.tmdb_api_key)
-                    enriched_films.append(enriched)
-                except Exception as e:
-                    click.echo(f"\n  Warning: TMDB error for {film.title}: {e}", err=True)
-                    enriched_films.append(film)
-                await asyncio.sleep(0.25)  # TMDB rate limit
+        # Fetch the feed (or first page) before doing any work on Notion or TMDB
+        try:
+            source = await primed(source)
+        except NotModifiedError:
+            echo("RSS feed unchanged since the last sync, nothing to do")
+            return
 
         if dry_run:
-            click.echo("\nDry run - would sync:")
+            films: list[Film] = []
+            async for film in source:
+                films.append(film)
+                if limit and len(films) >= limit:
+                    break
+            echo(f"Found {len(films)} films")
+            with recorder.stage("enrich"):
+                enriched_films = await _enrich(shared, films, settings, echo=echo)
+            echo("\nDry run - would sync:")
             for film in enriched_films:
                 status = "new"
                 stars = f" - {film.rating_stars}" if film.rating else ""
-                click.echo(f"  [{status}] {film.title} ({film.year}){stars}")
+                echo(f"  [{status}] {film.title} ({film.year}){stars}")
+            # Nothing was synced, so the next run must see the same responses again
+            http_cache.discard()
             return
 
-        # Sync to Notion
-        click.echo("\nSyncing to Notion...")
-        async with NotionClient(settings.notion_token) as notion:
-            sync_client = NotionSync(notion, settings.notion_database_id)
-            await sync_client.initialize()
-            click.echo(f"Found {sync_client.existing_count} existing entries in database")
+        # The index decides which films still need TMDB data
+        if sync_client.index_source is None:
+            await load_index()
+
+        try:
+            counts = await _sync_source(
+                shared,
+                sync_client,
+                source,
+                settings,
+                concurrency=concurrency,
+                limit=limit,
+                echo=echo,
+                journal=journal,
+            )
+        finally:
+            if journal is not None:
+                journal.close()
+
+        if journal is not None:
+            journal.finish()
+        revalidated = http_cache.revalidated
+        # A limited run left films unsynced; keep revalidating until a complete one
+        if not limit:
+            http_cache.commit()
+        recorder.observe_films(counts)
+        if revalidated:
+            echo(f"\n{revalidated} unchanged pages served from cache")
+        resumed = f", {counts['resumed']} written before resuming" if "resumed" in counts else ""
+        echo(
+            f"\nSync complete: {counts['created']} created, {counts['updated']} updated, "
+            f"{counts['skipped']} skipped (unchanged){resumed}"
+        )
 
-            def on_progress(film: Any, action: str) -> None:
-                symbol = "+" if action == "created" else "~"
-                click.echo(f"  [{symbol}] {film.title}")
 
-            counts = await sync_client.sync_films(enriched_films, on_progress=on_progress)
+async def _sync_source(
+    shared: _SharedClients,
+    sync_client: "NotionSync",
+    source: "AsyncIterator[Film]",
+    settings: "Settings",
+    concurrency: int,
+    limit: int | None,
+    echo: Callable[..., None],
+    journal: "SyncJournal | None" = None,
+) -> dict[str, int]:
+    """Enrich the films of ``source`` and write them to Notion, in a streaming pipeline.
+
+    Films the index already has TMDB data for aren't looked up again, and unchanged
+    films aren't written. With a journal, work it recorded is skipped and new work
+    is recorded in it.
+
+    Returns:
+        Number of films per action taken
+    """
+    from letterboxd2notion import metrics
+    from letterboxd2notion.parsers import enrich_film_with_tmdb
+    from letterboxd2notion.pipeline import run_pipeline
 
-            click.echo(f"\nSync complete: {counts['created']} created, {counts['updated']} updated")
+    recorder = metrics.recorder()
+    tmdb_cache = shared.tmdb_cache
+    refresh_after = timedelta(days=settings.tmdb_refresh_days)
+
+    async def enrich(film: "Film") -> "Film":
+        if journal is not None and (enriched := journal.enriched(film.letterboxd_id)):
+            return enriched
+        if not sync_client.needs_enrichment(film, refresh_after):
+            enriched = sync_client.with_known_enrichment(film)
+        else:
+            try:
+                with recorder.stage("enrich"):
+                    enriched = await enrich_film_with_tmdb(
+                        shared.tmdb_http,
+                        film,
+                        settings.tmdb_api_key,
+                        tmdb_cache,
+                        shared.tmdb_limiter,
+                    )
+            except Exception as e:
+                # Not journaled, so a resumed run tries again
+                echo(f"  Warning: TMDB error for {film.title}: {e}", err=True)
+                return film
+        if journal is not None:
+            journal.record_enriched(enriched)
+        return enriched
+
+    async def write(film: "Film") -> str:
+        if journal is not None and journal.written(film.letterboxd_id) is not None:
+            return "resumed"
+        with recorder.stage("write"):
+            page_id, action = await sync_client.sync_film(film)
+        if journal is not None:
+            journal.record_written(film.letterboxd_id, page_id, action)
+        if action != "skipped":
+            symbol = "+" if action == "created" else "~"
+            echo(f"  [{symbol}] {film.title}")
+        return action
+
+    echo("\nSyncing to Notion...")
+    with recorder.stage("sync"):
+        return await run_pipeline(
+            source,
+            enrich,
+            write,
+            enrich_concurrency=settings.tmdb_concurrency,
+            write_concurrency=concurrency,
+            limit=limit or None,
+        )
+
+
+async def _enrich(
+    shared: _SharedClients,
+    films: list["Film"],
+    settings: "Settings",
+    echo: Callable[..., None] = click.echo,
+) -> list["Film"]:
+    """Enrich films with TMDB data, with a progress bar."""
+    from letterboxd2notion.parsers import enrich_films
+
+    echo(f"Enriching {len(films)} films with TMDB data...")
+    with click.progressbar(length=len(films), label="Fetching backdrops") as bar:
+
+        def on_enriched(film: "Film", error: Exception | None) -> None:
+            if error is not None:
+                echo(f"\n  Warning: TMDB error for {film.title}: {error}", err=True)
+            bar.update(1)
+
+        enriched_films = await enrich_films(
+            shared.tmdb_http,
+            films,
+            settings.tmdb_api_key,
+            cache=shared.tmdb_cache,
+            limiter=shared.tmdb_limiter,
+            concurrency=settings.tmdb_concurrency,
+            on_film=on_enriched,
+        )
+
+    return enriched_films
+
+
+@main.command()
+@click.option("--dry-run", is_flag=True, help="Report orphaned pages without archiving them")
+@click.option(
+    "--max-fraction",
+    type=click.FloatRange(0, 1),
+    help="Refuse to archive more than this share of the pages (default: settings)",
+)
+@click.option("--force", is_flag=True, help="Archive even if over --max-fraction")
+@click.option("--concurrency", type=int, help="Max in-flight Notion writes (default: settings)")
+@click.option("--rebuild-index", is_flag=True, help="Rescan Notion, ignoring the index cache")
+@click.pass_context
+def reconcile(
+    ctx: click.Context,
+    dry_run: bool,
+    max_fraction: float | None,
+    force: bool,
+    concurrency: int | None,
+    rebuild_index: bool,
+) -> None:
+    """Archive Notion pages of diary entries deleted on Letterboxd.
+
+    Scrapes the whole diary (pages unchanged since the last scrape cost a conditional
+    request) and compares it with the Notion index; before archiving, a second scrape
+    confirms the entries are really gone. Pages without a Letterboxd ID are left
+    alone. If more than --max-fraction of the pages would be archived, nothing
+    is, so a scrape that came back short can't empty the database; pass --force if
+    those entries really were deleted.
+    """
+    import asyncio
+
+    settings = _require_settings(ctx)
+    done = asyncio.run(
+        _reconcile(
+            settings,
+            dry_run=dry_run,
+            max_fraction=settings.reconcile_max_fraction if max_fraction is None else max_fraction,
+            force=force,
+            concurrency=concurrency or settings.notion_concurrency,
+            rebuild_index=rebuild_index,
+        )
+    )
+    if not done:
+        ctx.exit(1)
+
+
+async def _reconcile(
+    settings: "Settings",
+    dry_run: bool,
+    max_fraction: float,
+    force: bool,
+    concurrency: int,
+    rebuild_index: bool,
+) -> bool:
+    """Async reconcile implementation; False if the safety threshold stopped it."""
+    from letterboxd2notion.models import viewing_id
+    from letterboxd2notion.notion.sync import NotionSync
+    from letterboxd2notion.parsers.cache import HTTPCache
+    from letterboxd2notion.parsers.html_parser import iter_diary_films
+    from letterboxd2notion.state import SyncState
+
+    click.echo(f"Reconciling for user: {settings.letterboxd_username}")
+
+    state = SyncState(
+        settings.sync_state_path,
+        settings.notion_database_id,
+        max_age=timedelta(days=settings.index_max_age_days),
+    )
+    http_cache = HTTPCache(settings.http_cache_path)
+    try:
+        async with (
+            _SharedClients.open(settings) as shared,
+            shared.notion(settings.notion_token) as notion,
+        ):
+            sync_client = NotionSync(notion, settings.notion_database_id, state=state)
+            click.echo("\nLoading Notion index...")
+            await sync_client.initialize(rebuild=rebuild_index)
+            existing = sync_client.existing_count
+            click.echo(
+                f"Found {existing} existing entries in database "
+                f"(index from {sync_client.index_source})"
+            )
+
+            async def scrape() -> set[str]:
+                # Any failed page raises, so a set is only returned for a complete scrape
+                current: set[str] = set()
+                async for film in iter_diary_films(
+                    shared.letterboxd_http,
+                    settings.letterboxd_diary_url,
+                    on_page=lambda p: click.echo(f"  Fetching page {p}..."),
+                    concurrency=settings.letterboxd_concurrency,
+                    limiter=shared.letterboxd_limiter,
+                    cache=http_cache,
+                ):
+                    if (vid := viewing_id(film.letterboxd_id)) is not None:
+                        current.add(vid)
+                if http_cache.revalidated:
+                    click.echo(f"{http_cache.revalidated} unchanged pages served from cache")
+                http_cache.commit()
+                return current
+
+            click.echo("\nScraping the diary via HTML...")
+            current = await scrape()
+            click.echo(f"Found {len(current)} diary entries")
+
+            orphans = sync_client.orphaned_pages(current)
+            if not orphans:
+                click.echo("\nNothing to archive, Notion matches the diary")
+                return True
+
+            click.echo(f"\n{len(orphans)} pages have no diary entry on Letterboxd:")
+            for entry in orphans:
+                click.echo(f"  [orphan] {entry.title} ({entry.letterboxd_id})")
+
+            over_limit = len(orphans) > max_fraction * existing
+            if dry_run:
+                click.echo(f"\nDry run - would archive {len(orphans)} pages")
+                if over_limit:
+                    click.echo(f"(more than {max_fraction:.0%} of the database, needs --force)")
+                return True
+            if over_limit and not force:
+                click.echo(
+                    f"\nRefusing to archive {len(orphans)} of {existing} pages, more than "
+                    f"{max_fraction:.0%}: the scrape may be incomplete. Re-run with --force "
+                    "if these entries really were deleted.",
+                    err=True,
+                )
+                return False
+
+            # A deletion during the scrape shifts later rows onto pages already fetched,
+            # so a live entry can be missed; only archive what a second scrape misses too
+            click.echo("\nScraping the diary again to confirm...")
+            confirmed = await scrape()
+            gone = []
+            for entry in orphans:
+                if viewing_id(entry.letterboxd_id or "") in confirmed:
+                    click.echo(f"  [kept] {entry.title} ({entry.letterboxd_id}) is in the diary")
+                else:
+                    gone.append(entry)
+            orphans = gone
+            if not orphans:
+                click.echo("\nNothing to archive, Notion matches the diary")
+                return True
+
+            click.echo(f"\nArchiving {len(orphans)} pages...")
+            archived = await sync_client.archive_pages(
+                orphans,
+                on_progress=lambda entry: click.echo(f"  [archived] {entry.title}"),
+                concurrency=concurrency,
+            )
+            click.echo(f"\nReconcile complete: {archived} archived")
+            return True
+    finally:
+        http_cache.close()
+        state.close()
 
 
 @main.command("init-schema")
 @click.pass_context
 def init_schema(ctx: click.Context) -> None:
     """Initialize Notion database with required properties."""
-    settings: Settings | None = ctx.obj.get("settings")
-    if settings is None:
-        click.echo(f"Error loading settings: {ctx.obj.get('settings_error')}", err=True)
-        ctx.exit(1)
+    import asyncio
+
+    settings = _require_settings(ctx)
 
     asyncio.run(_init_schema(settings))
 
 
-async def _init_schema(settings: Settings) -> None:
+async def _init_schema(settings: "Settings") -> None:
     """Initialize database schema."""
-    from letterboxd2notion.notion.client import NotionClient
     from letterboxd2notion.notion.schema import SCHEMA
 
     click.echo("Updating Notion database schema...")
 
-    async with NotionClient(settings.notion_token) as notion:
+    async with _notion_client(settings) as notion:
         # Get current database info
         db = await notion.get_database(settings.notion_database_id)
         title_list = db.get("title", [])
@@ -156,19 +1103,16 @@ async def _init_schema(settings: Settings) -> None:
 @click.pass_context
 def check_schema(ctx: click.Context) -> None:
     """Check the current Notion database schema."""
-    settings: Settings | None = ctx.obj.get("settings")
-    if settings is None:
-        click.echo(f"Error loading settings: {ctx.obj.get('settings_error')}", err=True)
-        ctx.exit(1)
+    import asyncio
+
+    settings = _require_settings(ctx)
 
     asyncio.run(_check_schema(settings))
 
 
-async def _check_schema(settings: Settings) -> None:
+async def _check_schema(settings: "Settings") -> None:
     """Check database schema."""
-    from letterboxd2notion.notion.client import NotionClient
-
-    async with NotionClient(settings.notion_token) as notion:
+    async with _notion_client(settings) as notion:
         db = await notion.get_database(settings.notion_database_id)
 
         title_list = db.get("title", [])
@@ -201,7 +1145,9 @@ async def _check_schema(settings: Settings) -> None:
 @click.pass_context
 def test_rss(ctx: click.Context, limit: int) -> None:
     """Test RSS feed parsing (no Notion connection needed)."""
-    settings: Settings | None = ctx.obj.get("settings")
+    import asyncio
+
+    settings = _settings(ctx)
 
     # Allow running without full settings - just need username
     username = settings.letterboxd_username if settings else "michaelfromyeg"
@@ -211,14 +1157,13 @@ def test_rss(ctx: click.Context, limit: int) -> None:
 
 async def _test_rss(username: str, limit: int) -> None:
     """Test RSS parsing."""
-    import httpx
-
     from letterboxd2notion.parsers.rss_parser import parse_rss_feed
+    from letterboxd2notion.transport import create_client
 
     rss_url = f"https://letterboxd.com/{username}/rss/"
     click.echo(f"Fetching RSS from: {rss_url}")
 
-    async with httpx.AsyncClient() as client:
+    async with create_client("letterboxd") as client:
         films = await parse_rss_feed(client, rss_url)
 
     click.echo(f"\nFound {len(films)} entries. Showing first {limit}:\n")
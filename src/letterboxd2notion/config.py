@@ -1,8 +1,12 @@
 """Application configuration using pydantic-settings."""
 
+import os
+import tomllib
 from functools import lru_cache
+from pathlib import Path
+from typing import Self
 
-from pydantic import Field
+from pydantic import BaseModel, ConfigDict, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -22,11 +26,101 @@ class Settings(BaseSettings):
     # TMDB configuration
     tmdb_api_key: str = Field(alias="TMDB_API_KEY")
 
+    # TMDB allows roughly 50 requests/second per IP; stay well below that
+    tmdb_rate_limit: float = Field(default=20, gt=0, description="TMDB requests per second")
+    tmdb_concurrency: int = Field(default=8, ge=1, description="Concurrent TMDB lookups")
+
     # Letterboxd configuration
     letterboxd_username: str = Field(default="michaelfromyeg", alias="LETTERBOXD_USERNAME")
+    letterboxd_rate_limit: float = Field(
+        default=1.0, gt=0, description="Letterboxd page requests per second"
+    )
+    letterboxd_concurrency: int = Field(default=4, ge=1, description="Diary pages fetched at once")
+    incremental_stop_streak: int = Field(
+        default=10, ge=1, description="Already-synced diary rows in a row that end a scrape"
+    )
+    fetch_reviews: bool = Field(
+        default=True, description="Fetch review text when scraping the diary"
+    )
 
     # Sync configuration
-    rate_limit_delay: float = Field(default=0.35, description="Seconds between API calls")
+    rate_limit_delay: float = Field(
+        default=0.35, ge=0, description="Seconds between API calls (0: no limit)"
+    )
+    rate_limit_burst: int = Field(default=3, ge=1, description="Notion requests allowed in a burst")
+    max_retries: int = Field(default=5, ge=0, description="Retries for throttled/failed requests")
+    notion_concurrency: int = Field(default=4, ge=1, description="Max in-flight Notion writes")
+    http2: bool = Field(default=False, description="Use HTTP/2 (needs the http2 extra)")
+
+    # Local state
+    cache_dir: Path = Field(default=Path(".cache/letterboxd2notion"), alias="CACHE_DIR")
+    index_max_age_days: float = Field(
+        default=7, description="Rescan the whole Notion database after this many days"
+    )
+
+    metrics_dir: Path | None = Field(
+        default=None,
+        alias="METRICS_DIR",
+        description="Directory to write run metrics to (JSON and Prometheus textfile)",
+    )
+
+    # Multi-account sync
+    targets_file: Path | None = Field(
+        default=None, alias="TARGETS_FILE", description="TOML file listing sync targets"
+    )
+    target_concurrency: int = Field(default=4, ge=1, description="Targets synced at once")
+
+    # Watch mode
+    watch_interval_minutes: float = Field(
+        default=15, gt=0, description="Minutes between RSS feed polls in watch mode"
+    )
+    watch_jitter: float = Field(
+        default=0.1, ge=0, le=1, description="Random spread of the poll interval, as a fraction"
+    )
+
+    # Reconcile
+    reconcile_max_fraction: float = Field(
+        default=0.1,
+        ge=0,
+        le=1,
+        description="Share of indexed pages reconcile may archive without --force",
+    )
+
+    tmdb_cache_ttl_days: float = Field(default=30, description="How long TMDB lookups are cached")
+    tmdb_refresh_days: float = Field(
+        default=90, description="Re-enrich existing pages last synced longer ago than this"
+    )
+    review_cache_ttl_days: float = Field(
+        default=90, description="How long review text scraped from Letterboxd is cached"
+    )
+
+    @property
+    def sync_state_path(self) -> Path:
+        """SQLite file caching the Notion index for the configured database."""
+        return self.cache_dir / f"index-{self.notion_database_id}.sqlite"
+
+    @property
+    def tmdb_cache_path(self) -> Path:
+        """SQLite file caching TMDB lookups."""
+        return self.cache_dir / "tmdb.sqlite"
+
+    @property
+    def review_cache_path(self) -> Path:
+        """SQLite file caching review text scraped from Letterboxd."""
+        return self.cache_dir / "reviews.sqlite"
+
+    @property
+    def journal_path(self) -> Path:
+        """SQLite progress journal of the current full sync."""
+        return self.cache_dir / f"journal-{self.notion_database_id}.sqlite"
+
+    @property
+    def http_cache_path(self) -> Path:
+        """SQLite file caching Letterboxd responses for conditional requests.
+
+        Kept per database: "unchanged" means unchanged since the last sync into it.
+        """
+        return self.cache_dir / f"http-{self.notion_database_id}.sqlite"
 
     @property
     def letterboxd_rss_url(self) -> str:
@@ -43,6 +137,67 @@ class Settings(BaseSettings):
         """Alternative diary URL (Letterboxd sometimes redirects)."""
         return f"https://letterboxd.com/{self.letterboxd_username}/diary"
 
+    def for_target(self, target: "SyncTarget") -> Self:
+        """These settings, pointed at one target's account and database."""
+        return self.model_copy(
+            update={
+                "letterboxd_username": target.username,
+                "notion_database_id": target.database_id,
+                "notion_token": target.resolve_token(self.notion_token),
+            }
+        )
+
+
+class SyncTarget(BaseModel):
+    """One Letterboxd account synced into one Notion database.
+
+    The Notion token is given inline (``token``), through an environment variable
+    (``token_env``), or defaults to ``TOKEN_V3``.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    username: str
+    database_id: str
+    token: str | None = None
+    token_env: str | None = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.username} -> {self.database_id}"
+
+    def resolve_token(self, default: str) -> str:
+        """The Notion integration token to sync this target with."""
+        if self.token:
+            return self.token
+        if self.token_env:
+            token = os.environ.get(self.token_env)
+            if not token:
+                raise ValueError(f"{self.token_env} is not set (token for {self.name})")
+            return token
+        if not default:
+            raise ValueError(f"No Notion token for {self.name}: set token, token_env or TOKEN_V3")
+        return default
+
+
+def load_targets(path: Path) -> list[SyncTarget]:
+    """Read sync targets from a TOML file of ``[[targets]]`` tables.
+
+    Raises:
+        ValueError: If the file is not valid TOML or a target is malformed
+    """
+    try:
+        data = tomllib.loads(path.read_text(encoding="utf-8"))
+    except tomllib.TOMLDecodeError as e:
+        raise ValueError(f"Invalid targets file {path}: {e}") from e
+    targets = [SyncTarget.model_validate(target) for target in data.get("targets", [])]
+    if not targets:
+        raise ValueError(f"No [[targets]] in {path}")
+    databases = [target.database_id for target in targets]
+    if len(set(databases)) != len(databases):
+        raise ValueError(f"Each target in {path} needs its own Notion database")
+    return targets
+
 
 @lru_cache
 def get_settings() -> Settings:
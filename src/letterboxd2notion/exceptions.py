@@ -17,9 +17,21 @@ class RateLimitError(LetterboxdError):
         super().__init__(f"Rate limited. Retry after: {retry_after}s")
 
 
+class NotModifiedError(LetterboxdError):
+    """Resource unchanged since it was last fetched (HTTP 304)."""
+
+    def __init__(self, url: str):
+        self.url = url
+        super().__init__(f"Not modified: {url}")
+
+
 class NotionError(LetterboxdError):
     """Error interacting with Notion API."""
 
+    def __init__(self, message: str, status: int | None = None):
+        self.status = status  # HTTP status of the response, if there was one
+        super().__init__(message)
+
 
 class TMDBError(LetterboxdError):
     """Error fetching TMDB data."""
@@ -0,0 +1,162 @@
+"""Durable progress journal (SQLite) for resuming interrupted full syncs."""
+
+import sqlite3
+from datetime import UTC, datetime
+from pathlib import Path
+
+from letterboxd2notion.models import FILM_LIST, Film
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    page INTEGER PRIMARY KEY,
+    page_count INTEGER,
+    films TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS enriched (
+    letterboxd_id TEXT PRIMARY KEY,
+    film TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS written (
+    letterboxd_id TEXT PRIMARY KEY,
+    page_id TEXT NOT NULL,
+    action TEXT NOT NULL
+);
+"""
+
+
+class SyncJournal:
+    """Record of a full sync's progress: scraped pages, enriched films and writes.
+
+    Every step is committed as soon as it completes, so after a crash, a 429 or a
+    CI timeout ``sync --full --resume`` picks up from the journal instead of
+    fetching, enriching or writing anything twice. The journal is deleted once a
+    sync completes.
+    """
+
+    def __init__(self, path: Path, database_id: str):
+        self.path = path
+        self.database_id = database_id
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _discard(self) -> None:
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def start(self, resume: bool = False) -> bool:
+        """Open the journal for a run.
+
+        Args:
+            resume: Continue the journal left by an interrupted run, if any
+
+        Returns:
+            True if an earlier run's progress is being resumed
+        """
+        if resume and self.path.exists():
+            try:
+                row = (
+                    self._connect()
+                    .execute("SELECT value FROM meta WHERE key = 'database_id'")
+                    .fetchone()
+                )
+                if row is not None and row[0] == self.database_id:
+                    return True
+            except sqlite3.DatabaseError:
+                pass
+
+        # Fresh run: drop whatever an earlier run left behind
+        self._discard()
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [
+                    ("database_id", self.database_id),
+                    ("started_at", datetime.now(UTC).isoformat()),
+                ],
+            )
+        return False
+
+    def finish(self) -> None:
+        """Delete the journal after a sync completed."""
+        self._discard()
+
+    def progress(self) -> dict[str, int]:
+        """Number of pages scraped, films enriched and films written so far."""
+        conn = self._connect()
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("pages", "enriched", "written")
+        }
+
+    def page(self, page: int) -> tuple[list[Film], int | None] | None:
+        """Films and page count of a diary page scraped earlier, if any."""
+        row = (
+            self._connect()
+            .execute("SELECT films, page_count FROM pages WHERE page = ?", (page,))
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return FILM_LIST.validate_json(row[0]), row[1]
+
+    def record_page(self, page: int, films: list[Film], page_count: int | None) -> None:
+        """Record the films parsed from a diary page."""
+        films_json = FILM_LIST.dump_json(films).decode()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", (page, page_count, films_json)
+            )
+
+    def enriched(self, letterboxd_id: str) -> Film | None:
+        """A film as enriched earlier, if it was."""
+        row = (
+            self._connect()
+            .execute("SELECT film FROM enriched WHERE letterboxd_id = ?", (letterboxd_id,))
+            .fetchone()
+        )
+        return Film.model_validate_json(row[0]) if row else None
+
+    def record_enriched(self, film: Film) -> None:
+        """Record an enriched film."""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO enriched VALUES (?, ?)",
+                (film.letterboxd_id, film.model_dump_json()),
+            )
+
+    def written(self, letterboxd_id: str) -> str | None:
+        """Notion page ID a film was written to earlier, if it was."""
+        row = (
+            self._connect()
+            .execute("SELECT page_id FROM written WHERE letterboxd_id = ?", (letterboxd_id,))
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def record_written(self, letterboxd_id: str, page_id: str, action: str) -> None:
+        """Record a committed Notion write (or a skip of an unchanged page)."""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO written VALUES (?, ?, ?)",
+                (letterboxd_id, page_id, action),
+            )
@@ -0,0 +1,271 @@
+"""Request and stage metrics for sync runs, exported as JSON and Prometheus text.
+
+The API clients and fetchers report into the process-wide recorder returned by
+``recorder()``; a run calls ``reset()`` when it starts and writes the recorder out
+when it ends.
+"""
+
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+PREFIX = "letterboxd2notion"
+
+# Request latency histogram bounds, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass
+class Histogram:
+    """Request latency histogram over ``LATENCY_BUCKETS``, plus an overflow bucket."""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    total: float = 0.0
+    count: int = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """(upper bound, observations at or below it) pairs, ending with +Inf."""
+        running = 0
+        pairs = []
+        for bound, count in zip((*map(str, LATENCY_BUCKETS), "+Inf"), self.counts, strict=True):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+
+class Metrics:
+    """Per-service request metrics and per-stage wall time of one sync run.
+
+    Services are "letterboxd", "tmdb" and "notion". Stage times are busy time:
+    stages of the streaming pipeline overlap, and a stage run by several workers
+    adds up the time each of them spent in it.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.time()
+        self.latency: defaultdict[str, Histogram] = defaultdict(Histogram)
+        self.statuses: Counter[tuple[str, str]] = Counter()
+        self.retries: Counter[str] = Counter()
+        self.wait_seconds: Counter[str] = Counter()
+        self.bytes_sent: Counter[str] = Counter()
+        self.bytes_received: Counter[str] = Counter()
+        self.stage_seconds: Counter[str] = Counter()
+        self.films: Counter[str] = Counter()
+        self.success: bool | None = None
+
+    def observe_request(
+        self,
+        service: str,
+        status: int | str,
+        seconds: float,
+        sent: int = 0,
+        received: int = 0,
+    ) -> None:
+        """Record one HTTP request; ``status`` is "error" when no response came back."""
+        self.latency[service].observe(seconds)
+        self.statuses[service, str(status)] += 1
+        self.bytes_sent[service] += sent
+        self.bytes_received[service] += received
+
+    def observe_retry(self, service: str) -> None:
+        """Record a request being retried."""
+        self.retries[service] += 1
+
+    def observe_wait(self, service: str, seconds: float) -> None:
+        """Record time spent waiting on a rate limiter, ``Retry-After`` or backoff."""
+        if seconds > 0:
+            self.wait_seconds[service] += seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Add the time spent in the block to stage ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds[name] += time.perf_counter() - start
+
+    def observe_films(self, counts: dict[str, int]) -> None:
+        """Record the number of films per sync action, e.g. {"created": N, ...}."""
+        self.films.update(counts)
+
+    def finish(self, success: bool) -> None:
+        """Mark the run as done."""
+        self.success = success
+        self.stage_seconds["total"] = time.time() - self.started
+
+    def to_dict(self) -> dict[str, Any]:
+        """All metrics as JSON-serializable data."""
+        services = sorted(set(self.latency) | set(self.retries) | set(self.wait_seconds))
+        return {
+            "started_at": self.started,
+            "success": self.success,
+            "stages": dict(self.stage_seconds),
+            "films": dict(self.films),
+            "services": {
+                service: {
+                    "requests": self.latency[service].count,
+                    "statuses": {
+                        status: count
+                        for (name, status), count in sorted(self.statuses.items())
+                        if name == service
+                    },
+                    "latency_seconds": {
+                        "sum": self.latency[service].total,
+                        "buckets": dict(self.latency[service].cumulative()),
+                    },
+                    "retries": self.retries[service],
+                    "wait_seconds": self.wait_seconds[service],
+                    "bytes_sent": self.bytes_sent[service],
+                    "bytes_received": self.bytes_received[service],
+                }
+                for service in services
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+
+        def metric(name: str, kind: str, help_: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# HELP {PREFIX}_{name} {help_}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+            lines.extend(f"{PREFIX}_{name}{labels} {value}" for labels, value in samples)
+
+        metric(
+            "last_run_timestamp_seconds",
+            "gauge",
+            "When the last sync run started.",
+            [("", self.started)],
+        )
+        if self.success is not None:
+            metric(
+                "last_run_success",
+                "gauge",
+                "Whether the last sync run succeeded.",
+                [("", int(self.success))],
+            )
+        metric(
+            "stage_seconds",
+            "gauge",
+            "Busy time per sync stage in the last run.",
+            [(f'{{stage="{stage}"}}', s) for stage, s in sorted(self.stage_seconds.items())],
+        )
+        metric(
+            "films",
+            "gauge",
+            "Films per sync action in the last run.",
+            [(f'{{action="{action}"}}', n) for action, n in sorted(self.films.items())],
+        )
+        metric(
+            "requests",
+            "gauge",
+            "HTTP requests per service and status in the last run.",
+            [
+                (f'{{service="{service}",status="{status}"}}', n)
+                for (service, status), n in sorted(self.statuses.items())
+            ],
+        )
+
+        latency: list[tuple[str, float]] = []
+        for service, histogram in sorted(self.latency.items()):
+            latency.extend(
+                (f'_bucket{{service="{service}",le="{bound}"}}', n)
+                for bound, n in histogram.cumulative()
+            )
+            latency.append((f'_sum{{service="{service}"}}', histogram.total))
+            latency.append((f'_count{{service="{service}"}}', histogram.count))
+        metric("request_seconds", "histogram", "HTTP request latency.", latency)
+
+        for name, help_, counter in (
+            ("retries", "Retried requests per service in the last run.", self.retries),
+            ("wait_seconds", "Time waiting on rate limits and backoff.", self.wait_seconds),
+            ("sent_bytes", "Request body bytes sent per service.", self.bytes_sent),
+            ("received_bytes", "Response body bytes received per service.", self.bytes_received),
+        ):
+            metric(
+                name,
+                "gauge",
+                help_,
+                [(f'{{service="{service}"}}', v) for service, v in sorted(counter.items())],
+            )
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: Path) -> tuple[Path, Path]:
+        """Write ``letterboxd2notion.json`` and ``letterboxd2notion.prom`` to ``directory``.
+
+        Files are replaced atomically, so a node exporter textfile collector never
+        reads a partial file.
+
+        Returns:
+            Paths of the JSON and Prometheus files
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        json_path = directory / f"{PREFIX}.json"
+        prom_path = directory / f"{PREFIX}.prom"
+        _write_atomic(json_path, json.dumps(self.to_dict(), indent=2) + "\n")
+        _write_atomic(prom_path, self.to_prometheus())
+        return json_path, prom_path
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+_recorder = Metrics()
+
+
+def recorder() -> Metrics:
+    """The metrics recorder of the current run."""
+    return _recorder
+
+
+def reset() -> Metrics:
+    """Start recording a new run."""
+    global _recorder
+    _recorder = Metrics()
+    return _recorder
+
+
+async def timed_request(
+    service: str, send: Callable[[], Awaitable[httpx.Response]]
+) -> httpx.Response:
+    """Send a request via ``send()`` and record its latency, status and body sizes.
+
+    A 304 counts as an empty body, even when the conditional-request cache has
+    filled in the cached one.
+    """
+    start = time.perf_counter()
+    try:
+        response = await send()
+    except httpx.TransportError:
+        _recorder.observe_request(service, "error", time.perf_counter() - start)
+        raise
+    _recorder.observe_request(
+        service,
+        response.status_code,
+        time.perf_counter() - start,
+        sent=len(response.request.content),
+        received=0 if response.status_code == 304 else len(response.content),
+    )
+    return response
@@ -1,14 +1,40 @@
 """Data models for letterboxd2notion."""
 
+import contextlib
+import re
 from datetime import date
 from typing import Any
 
-from pydantic import BaseModel, Field, computed_field
+from pydantic import BaseModel, Field, TypeAdapter, computed_field
+
+# letterboxd-review-N / letterboxd-watch-N (RSS guid), letterboxd-viewing-N (diary HTML)
+_LETTERBOXD_ID_RE = re.compile(r"letterboxd-[a-z]+-(\d+)")
+
+
+def viewing_id(letterboxd_id: str) -> str | None:
+    """Extract the diary entry (viewing) number from a Letterboxd ID.
+
+    RSS items and scraped diary rows prefix it differently but share the number,
+    so this identifies an entry regardless of where it was first synced from.
+    """
+    match = _LETTERBOXD_ID_RE.fullmatch(letterboxd_id)
+    return match.group(1) if match else None
+
+
+# Star strings for every valid rating (0.5 to 5.0 in half-star steps)
+_RATING_STARS = {
+    half_stars / 2: "\u2605" * (half_stars // 2) + ("\u00bd" if half_stars % 2 else "")
+    for half_stars in range(1, 11)
+}
 
 
 class Film(BaseModel):
     """Represents a film entry from Letterboxd."""
 
+    # Holds the result of to_notion_properties(); being a slot rather than a field
+    # or private attribute, it is left out of copies, comparisons and dumps
+    __slots__ = ("_notion_properties",)
+
     # Core identifiers
     letterboxd_id: str = Field(description="From guid: letterboxd-review-XXX")
     tmdb_id: int | None = Field(default=None, description="TMDB movie ID from RSS")
@@ -23,6 +49,8 @@ class Film(BaseModel):
     watched_date: date | None = None
     rewatch: bool = False
     review: str | None = None
+    # Review page linked from the diary (HTML only); the text itself is fetched separately
+    review_url: str | None = None
 
     # Enrichment data (from TMDB)
     backdrop_url: str | None = None
@@ -34,12 +62,33 @@ class Film(BaseModel):
         """Convert numeric rating to star representation for display."""
         if self.rating is None:
             return ""
-        full_stars = int(self.rating)
-        half_star = self.rating % 1 >= 0.5
-        return "\u2605" * full_stars + ("\u00bd" if half_star else "")
+        stars = _RATING_STARS.get(self.rating)
+        if stars is None:
+            full_stars = int(self.rating)
+            half_star = self.rating % 1 >= 0.5
+            stars = "\u2605" * full_stars + ("\u00bd" if half_star else "")
+        return stars
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Any change invalidates the cached Notion properties
+        with contextlib.suppress(AttributeError):
+            object.__delattr__(self, "_notion_properties")
+        super().__setattr__(name, value)
 
     def to_notion_properties(self) -> dict[str, Any]:
-        """Convert to Notion API property format."""
+        """Convert to Notion API property format.
+
+        The result is computed once per film and shared between calls, so treat
+        it as read-only.
+        """
+        try:
+            return self._notion_properties
+        except AttributeError:
+            props = self._build_notion_properties()
+            object.__setattr__(self, "_notion_properties", props)
+            return props
+
+    def _build_notion_properties(self) -> dict[str, Any]:
         props: dict[str, Any] = {
             "Title": {"title": [{"text": {"content": self.title}}]},
             "Movie URL": {"url": self.letterboxd_url},
@@ -68,3 +117,7 @@ class Film(BaseModel):
             props["TMDB ID"] = {"number": self.tmdb_id}
 
         return props
+
+
+# Bulk (de)serialization of many films at once, e.g. a scraped diary page
+FILM_LIST = TypeAdapter(list[Film])
@@ -1,6 +1,25 @@
-"""Notion API integration."""
+"""Notion API integration.
 
-from letterboxd2notion.notion.client import NotionClient
-from letterboxd2notion.notion.sync import NotionSync
+``NotionClient`` and ``NotionSync`` are imported on first use, so reading the schema
+doesn't load the HTTP client or the film model.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from letterboxd2notion.notion.client import NotionClient
+    from letterboxd2notion.notion.sync import NotionSync
 
 __all__ = ["NotionClient", "NotionSync"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "NotionClient":
+        from letterboxd2notion.notion.client import NotionClient
+
+        return NotionClient
+    if name == "NotionSync":
+        from letterboxd2notion.notion.sync import NotionSync
+
+        return NotionSync
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
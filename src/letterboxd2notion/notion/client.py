@@ -1,73 +1,130 @@
 """Async Notion API client with rate limiting."""
 
 import asyncio
-import time
 from typing import Any
 
 import httpx
 
+from letterboxd2notion import metrics
 from letterboxd2notion.exceptions import NotionError, RateLimitError
+from letterboxd2notion.ratelimit import (
+    TokenBucket,
+    backoff_delay,
+    parse_retry_after,
+    rate_for_delay,
+)
+from letterboxd2notion.transport import create_client
 
 NOTION_API_BASE = "https://api.notion.com/v1"
 NOTION_VERSION = "2022-06-28"
 
+# Responses worth retrying: throttling and transient server-side failures
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
 
 class NotionClient:
-    """Async Notion API client with rate limiting."""
+    """Async Notion API client with rate limiting.
+
+    Pass ``client`` to send requests through a shared connection pool (it is left
+    open on exit), and ``limiter`` to share one integration token's rate limit
+    between several clients.
+    """
 
     def __init__(
         self,
         token: str,
         rate_limit_delay: float = 0.35,  # ~3 requests/second
+        burst: int = 3,
+        max_retries: int = 5,
+        transport: httpx.AsyncBaseTransport | None = None,
+        client: httpx.AsyncClient | None = None,
+        limiter: TokenBucket | None = None,
     ):
         self.token = token
         self.rate_limit_delay = rate_limit_delay
-        self._last_request_time: float = 0
+        self.max_retries = max_retries
+        self.limiter = limiter or TokenBucket(rate_for_delay(rate_limit_delay), capacity=burst)
+        self.transport = transport  # e.g. a mock transport for offline benchmarks
+        self._headers = {
+            "Authorization": f"Bearer {token}",
+            "Notion-Version": NOTION_VERSION,
+            "Content-Type": "application/json",
+        }
+        self._shared_client = client
         self._client: httpx.AsyncClient | None = None
 
     async def __aenter__(self) -> "NotionClient":
-        self._client = httpx.AsyncClient(
-            base_url=NOTION_API_BASE,
-            headers={
-                "Authorization": f"Bearer {self.token}",
-                "Notion-Version": NOTION_VERSION,
-                "Content-Type": "application/json",
-            },
-            timeout=30.0,
-        )
+        self._client = self._shared_client or create_client("notion", transport=self.transport)
         return self
 
     async def __aexit__(self, *args: Any) -> None:
-        if self._client:
+        if self._client is not None and self._client is not self._shared_client:
             await self._client.aclose()
+        self._client = None
 
     async def _request(
         self,
         method: str,
         path: str,
+        idempotent: bool = True,
         **kwargs: Any,
     ) -> dict[str, Any]:
-        """Make a rate-limited request to Notion API."""
+        """Make a rate-limited request to Notion API.
+
+        429s are always retried (honouring ``Retry-After``), since Notion rejected the
+        request outright. 5xx responses and transport errors are only retried for
+        idempotent requests, so a create that may have landed is never replayed.
+        """
         if self._client is None:
             raise NotionError("Client not initialized. Use async context manager.")
 
-        # Rate limiting
-        now = time.monotonic()
-        elapsed = now - self._last_request_time
-        if elapsed < self.rate_limit_delay:
-            await asyncio.sleep(self.rate_limit_delay - elapsed)
-
-        response = await self._client.request(method, path, **kwargs)
-        self._last_request_time = time.monotonic()
-
-        if response.status_code == 429:
-            retry_after = int(response.headers.get("Retry-After", 60))
-            raise RateLimitError(retry_after=retry_after)
-
-        if response.status_code >= 400:
-            raise NotionError(f"Notion API error {response.status_code}: {response.text}")
-
-        return response.json()
+        client = self._client
+        recorder = metrics.recorder()
+        attempt = 0
+        while True:
+            recorder.observe_wait("notion", await self.limiter.acquire())
+
+            try:
+                response = await metrics.timed_request(
+                    "notion",
+                    lambda: client.request(
+                        method, f"{NOTION_API_BASE}{path}", headers=self._headers, **kwargs
+                    ),
+                )
+            except httpx.TransportError as e:
+                retryable = idempotent or isinstance(e, httpx.ConnectError)
+                if not retryable or attempt >= self.max_retries:
+                    raise NotionError(f"Notion request failed: {e!r}") from e
+                delay = backoff_delay(attempt)
+                recorder.observe_wait("notion", delay)
+                recorder.observe_retry("notion")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            status = response.status_code
+            if status < 400:
+                self.limiter.on_success()
+                return response.json()
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            retryable = status == 429 or (idempotent and status in RETRY_STATUS_CODES)
+            if not retryable or attempt >= self.max_retries:
+                if status == 429:
+                    raise RateLimitError(retry_after=int(retry_after or 60))
+                raise NotionError(f"Notion API error {status}: {response.text}", status=status)
+
+            if status == 429:
+                # The limiter pauses every caller until Retry-After and slows down;
+                # the pause shows up as limiter wait on the next attempt
+                self.limiter.on_throttle(retry_after)
+            if status != 429 or retry_after is None:
+                # A 5xx's Retry-After only concerns this request, so wait for it here
+                delay = backoff_delay(attempt) if retry_after is None else retry_after
+                recorder.observe_wait("notion", delay)
+                await asyncio.sleep(delay)
+            recorder.observe_retry("notion")
+            attempt += 1
 
     async def query_database(
         self,
@@ -76,8 +133,13 @@ class NotionClient:
         sorts: list[dict[str, Any]] | None = None,
         start_cursor: str | None = None,
         page_size: int = 100,
+        filter_properties: list[str] | None = None,
     ) -> dict[str, Any]:
-        """Query a Notion database."""
+        """Query a Notion database.
+
+        ``filter_properties`` limits the returned page properties to the given
+        property IDs, which keeps responses small for wide databases.
+        """
         body: dict[str, Any] = {"page_size": page_size}
         if filter_:
             body["filter"] = filter_
@@ -89,6 +151,7 @@ class NotionClient:
         return await self._request(
             "POST",
             f"/databases/{database_id}/query",
+            params={"filter_properties": filter_properties} if filter_properties else None,
             json=body,
         )
 
@@ -101,6 +164,7 @@ class NotionClient:
         return await self._request(
             "POST",
             "/pages",
+            idempotent=False,
             json={
                 "parent": {"database_id": database_id},
                 "properties": properties,
@@ -119,6 +183,14 @@ class NotionClient:
             json={"properties": properties},
         )
 
+    async def archive_page(self, page_id: str) -> dict[str, Any]:
+        """Archive a page (Notion's delete; it can be restored from the trash)."""
+        return await self._request(
+            "PATCH",
+            f"/pages/{page_id}",
+            json={"archived": True},
+        )
+
     async def get_database(self, database_id: str) -> dict[str, Any]:
         """Get database metadata including schema."""
         return await self._request("GET", f"/databases/{database_id}")
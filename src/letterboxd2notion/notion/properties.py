@@ -0,0 +1,83 @@
+"""Normalization and fingerprinting of Notion page properties.
+
+Notion returns property values in a richer shape than we send them (``plain_text``,
+annotations, ``id``/``type`` keys, ...). These helpers reduce both shapes to plain
+Python values so the desired state of a film can be compared with a page as read.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+from letterboxd2notion.notion.schema import SCHEMA
+
+
+def _text(items: list[dict[str, Any]] | None) -> str | None:
+    text = "".join(
+        item.get("plain_text") or item.get("text", {}).get("content", "") for item in items or []
+    )
+    return text or None
+
+
+def _number(value: float | None) -> float | int | None:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _files(files: list[dict[str, Any]] | None) -> list[list[str | None]] | None:
+    # Uploaded files have short-lived signed URLs, so only external URLs are compared
+    normalized = [[f.get("name"), f.get("external", {}).get("url")] for f in files or []]
+    return normalized or None
+
+
+def normalize_property(value: dict[str, Any]) -> Any:
+    """Reduce a property value (as sent or as read) to a plain comparable value."""
+    prop_type = value.get("type") or next(iter(value), None)
+    raw = value.get(prop_type) if prop_type else None
+
+    match prop_type:
+        case "title" | "rich_text":
+            return _text(raw)
+        case "number":
+            return _number(raw)
+        case "date":
+            return raw.get("start") if raw else None
+        case "files":
+            return _files(raw)
+        case _:
+            return raw
+
+
+def normalize_properties(properties: dict[str, Any]) -> dict[str, Any]:
+    """Normalize the schema-managed properties of a page, dropping empty values."""
+    normalized: dict[str, Any] = {}
+    for name, value in properties.items():
+        if name not in SCHEMA or not isinstance(value, dict):
+            continue
+        plain = normalize_property(value)
+        if plain is not None:
+            normalized[name] = plain
+    return normalized
+
+
+def fingerprint(normalized: dict[str, Any]) -> str:
+    """Stable content hash of normalized properties."""
+    payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def changed_properties(
+    properties: dict[str, Any],
+    existing: dict[str, Any],
+) -> dict[str, Any]:
+    """Select the properties whose value differs from an existing normalized page.
+
+    Properties set on the page but absent from ``properties`` are left alone, the same
+    way a full update would leave them.
+    """
+    return {
+        name: value
+        for name, value in properties.items()
+        if normalize_property(value) != existing.get(name)
+    }
@@ -1,9 +1,33 @@
 """Sync logic with upsert and deduplication."""
 
-from collections.abc import Callable
+import asyncio
+import weakref
+from collections.abc import Callable, Collection
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from urllib.parse import unquote
 
-from letterboxd2notion.models import Film
+from letterboxd2notion.exceptions import NotionError
+from letterboxd2notion.models import Film, viewing_id
 from letterboxd2notion.notion.client import NotionClient
+from letterboxd2notion.notion.properties import (
+    changed_properties,
+    fingerprint,
+    normalize_properties,
+)
+from letterboxd2notion.notion.schema import SCHEMA
+from letterboxd2notion.state import IndexEntry, SyncState
+
+
+def _page_gone(error: NotionError) -> bool:
+    """Whether a failed page update means the page was archived or deleted."""
+    # Notion answers 400 "Can't edit block that is archived" and 404 once deleted
+    return error.status == 404 or (error.status == 400 and "archived" in str(error))
+
+
+def _viewing(entry: IndexEntry) -> str | None:
+    """Viewing number of the diary entry an indexed page belongs to, if any."""
+    return viewing_id(entry.letterboxd_id) if entry.letterboxd_id else None
 
 
 class NotionSync:
@@ -13,111 +37,417 @@ class NotionSync:
         self,
         client: NotionClient,
         database_id: str,
+        state: SyncState | None = None,
     ):
         self.client = client
         self.database_id = database_id
+        self.state = state
+        self.index_source: str | None = None  # "cache" or "notion" once initialized
         self._id_to_page: dict[str, str] = {}  # letterboxd_id -> page_id
+        self._viewing_to_page: dict[str, str] = {}  # viewing number -> page_id
         self._title_to_page: dict[str, str] = {}  # title -> page_id (fallback)
+        self._page_properties: dict[str, dict[str, Any]] = {}  # page_id -> normalized props
+        self._pages: dict[str, IndexEntry] = {}  # page_id -> index entry
+        self._high_water: str | None = None  # latest last_edited_time seen in Notion
+        # title -> lock (concurrent writes); a lock goes once no write holds or awaits it
+        self._title_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+
+    async def initialize(self, rebuild: bool = False, delta: bool = True) -> None:
+        """Initialize sync state by loading existing pages.
+
+        With a local state store the index is loaded from disk; the full Notion scan
+        only runs when the cache is missing, stale or corrupt, or ``rebuild`` is set.
+        In ``delta`` mode a cached index is then brought up to date by reading only
+        the pages edited since the previous run's high-water mark.
+        """
+        if self.state is not None and not rebuild:
+            entries = self.state.load()
+            if entries is not None:
+                for entry in entries:
+                    self._index_page(entry)
+                self._high_water = self.state.get_high_water()
+                self.index_source = "cache"
+                if delta and self._high_water is not None:
+                    await self.refresh_index()
+                return
+
+        # An empty database yields no last_edited_time, so fall back to the scan start
+        # (with a margin for clock skew between us and Notion)
+        started = datetime.now(UTC) - timedelta(minutes=5)
+        entries = await self._load_existing_pages(
+            filter_properties=await self._schema_property_ids()
+        )
+        if self._high_water is None:
+            self._high_water = started.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        self.index_source = "notion"
+        if self.state is not None:
+            self.state.replace(entries, self._high_water)
+
+    async def refresh_index(self) -> int:
+        """Merge pages edited since the high-water mark into the index.
+
+        Notion rounds ``last_edited_time`` to the minute, so the filter is inclusive
+        and pages edited in the same minute as the mark are read again.
+
+        Returns:
+            Number of pages read
+        """
+        if self._high_water is None:
+            return 0
+
+        entries = await self._load_existing_pages(
+            filter_={
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": self._high_water},
+            },
+            sorts=[{"timestamp": "last_edited_time", "direction": "ascending"}],
+        )
+        # Pages new to the index count as synced now, as they do in the state store
+        now = datetime.now(UTC)
+        for entry in entries:
+            if entry.synced_at is None:
+                entry.synced_at = now
+        if self.state is not None:
+            self.state.record_many(entries, self._high_water)
+        return len(entries)
 
-    async def initialize(self) -> None:
-        """Initialize sync state by loading existing pages."""
-        await self._load_existing_pages()
+    async def _load_existing_pages(
+        self,
+        filter_: dict[str, Any] | None = None,
+        sorts: list[dict[str, Any]] | None = None,
+        filter_properties: list[str] | None = None,
+    ) -> list[IndexEntry]:
+        """Load existing pages (all of them by default) and build lookup indexes.
 
-    async def _load_existing_pages(self) -> None:
-        """Load all existing pages and build lookup indexes."""
+        Args:
+            filter_: Optional Notion query filter
+            sorts: Optional Notion query sorts
+            filter_properties: Property IDs to project the response onto
+        """
+        entries: list[IndexEntry] = []
         start_cursor: str | None = None
 
         while True:
             result = await self.client.query_database(
                 self.database_id,
+                filter_=filter_,
+                sorts=sorts,
                 start_cursor=start_cursor,
+                filter_properties=filter_properties,
             )
 
             for page in result.get("results", []):
-                props = page.get("properties", {})
                 page_id = page["id"]
 
-                # Try Letterboxd ID first
-                lb_id_prop = props.get("Letterboxd ID", {})
-                rich_text = lb_id_prop.get("rich_text", [])
-                if rich_text:
-                    lb_id = rich_text[0].get("plain_text", "")
-                    if lb_id:
-                        self._id_to_page[lb_id] = page_id
-
-                # Also index by title for legacy entries
-                title_prop = props.get("Title", {})
-                title_list = title_prop.get("title", [])
-                if title_list:
-                    title = title_list[0].get("plain_text", "")
-                    if title:
-                        self._title_to_page[title] = page_id
+                # Only schema-managed properties are kept, both for change detection
+                # and for the Letterboxd ID / Title lookup indexes
+                normalized = normalize_properties(page.get("properties", {}))
+                self._page_properties[page_id] = normalized
+
+                backdrop = normalized.get("Backdrop")
+                entry = IndexEntry(
+                    page_id,
+                    normalized.get("Letterboxd ID"),
+                    normalized.get("Title"),
+                    fingerprint(normalized),
+                    tmdb_id=normalized.get("TMDB ID"),
+                    backdrop_url=backdrop[0][1] if backdrop else None,
+                )
+                self._index_page(entry)
+                entries.append(entry)
+
+                edited = page.get("last_edited_time")
+                if edited and (self._high_water is None or edited > self._high_water):
+                    self._high_water = edited
 
             if not result.get("has_more"):
                 break
             start_cursor = result.get("next_cursor")
 
+        return entries
+
+    async def _schema_property_ids(self) -> list[str] | None:
+        """Resolve the IDs of the schema-managed properties for query projection.
+
+        Costs one extra request, so it is only used for full scans; delta refreshes
+        read few pages and are left unprojected.
+        """
+        database = await self.client.get_database(self.database_id)
+        properties = database.get("properties", {})
+        # IDs come back URL-encoded; decode them so httpx encodes them exactly once
+        ids = [unquote(properties[name]["id"]) for name in SCHEMA if name in properties]
+        return ids or None
+
+    def _index_page(self, entry: IndexEntry) -> None:
+        """Add a page to the lookup indexes, replacing what was known about it."""
+        previous = self._pages.get(entry.page_id)
+        if previous is not None:
+            if entry.synced_at is None:
+                entry.synced_at = previous.synced_at
+            # Drop keys the page no longer has (e.g. retitled by hand in Notion)
+            for old_key, new_key, index in (
+                (previous.letterboxd_id, entry.letterboxd_id, self._id_to_page),
+                (_viewing(previous), _viewing(entry), self._viewing_to_page),
+                (previous.title, entry.title, self._title_to_page),
+            ):
+                if old_key and old_key != new_key and index.get(old_key) == entry.page_id:
+                    del index[old_key]
+
+        self._pages[entry.page_id] = entry
+        if entry.letterboxd_id:
+            self._id_to_page[entry.letterboxd_id] = entry.page_id
+            if (vid := _viewing(entry)) is not None:
+                self._viewing_to_page[vid] = entry.page_id
+        if entry.title:
+            self._title_to_page[entry.title] = entry.page_id
+
     def _find_existing_page(self, film: Film) -> str | None:
         """Find existing page ID for a film."""
         # Check by Letterboxd ID first
         if film.letterboxd_id in self._id_to_page:
             return self._id_to_page[film.letterboxd_id]
 
-        # Fallback to title match
-        if film.title in self._title_to_page:
-            return self._title_to_page[film.title]
+        # Then by diary entry, which RSS items and scraped rows prefix differently
+        vid = viewing_id(film.letterboxd_id)
+        if vid is not None and vid in self._viewing_to_page:
+            return self._viewing_to_page[vid]
+
+        # Fallback to title match, unless the page belongs to another diary entry
+        # (a rewatch gets a page of its own)
+        page_id = self._title_to_page.get(film.title)
+        if page_id is not None and (vid is None or _viewing(self._pages[page_id]) is None):
+            return page_id
 
         return None
 
+    def synced_viewing_ids(self) -> set[str]:
+        """Viewing numbers of all diary entries that have a page in the index."""
+        return set(self._viewing_to_page)
+
+    def orphaned_pages(self, viewing_ids: Collection[str]) -> list[IndexEntry]:
+        """Indexed pages whose diary entry is not among ``viewing_ids``.
+
+        One pass over the index, so pass a set. Pages without a Letterboxd ID (e.g.
+        added by hand in Notion) are never reported.
+        """
+        return [
+            entry
+            for entry in self._pages.values()
+            if (vid := _viewing(entry)) is not None and vid not in viewing_ids
+        ]
+
+    def _forget_page(self, page_id: str) -> None:
+        """Drop a page from the lookup indexes."""
+        self._page_properties.pop(page_id, None)
+        entry = self._pages.pop(page_id, None)
+        if entry is None:
+            return
+        for key, index in (
+            (entry.letterboxd_id, self._id_to_page),
+            (_viewing(entry), self._viewing_to_page),
+            (entry.title, self._title_to_page),
+        ):
+            if key and index.get(key) == page_id:
+                del index[key]
+
+    def needs_enrichment(self, film: Film, refresh_after: timedelta | None = None) -> bool:
+        """Whether a film should be looked up on TMDB before syncing.
+
+        True for films without a page yet, for pages missing a TMDB ID or backdrop,
+        and for pages we last wrote more than ``refresh_after`` ago.
+        """
+        page_id = self._find_existing_page(film)
+        entry = self._pages.get(page_id) if page_id else None
+        if entry is None or entry.tmdb_id is None or entry.backdrop_url is None:
+            return True
+        if refresh_after is not None and entry.synced_at is not None:
+            return datetime.now(UTC) - entry.synced_at > refresh_after
+        return False
+
+    def with_known_enrichment(self, film: Film) -> Film:
+        """Copy the TMDB data already on a film's page onto the film."""
+        page_id = self._find_existing_page(film)
+        entry = self._pages.get(page_id) if page_id else None
+        if entry is None:
+            return film
+        return film.model_copy(
+            update={
+                "tmdb_id": film.tmdb_id or entry.tmdb_id,
+                "backdrop_url": film.backdrop_url or entry.backdrop_url,
+            }
+        )
+
     async def sync_film(self, film: Film) -> tuple[str, str]:
         """Sync a single film to Notion.
 
+        Writes for films sharing a title are serialized, so concurrent callers never
+        create duplicate pages for the same film or race on the index updates.
+
         Returns:
             Tuple of (page_id, action) where action is "created", "updated", or "skipped"
         """
-        properties = film.to_notion_properties()
+        lock = self._title_locks.setdefault(film.title, asyncio.Lock())
+        async with lock:
+            return await self._sync_film(film)
+
+    async def _sync_film(self, film: Film) -> tuple[str, str]:
+        """Upsert a single film; caller must hold the film's title lock."""
         existing_page_id = self._find_existing_page(film)
+        known = self._pages.get(existing_page_id) if existing_page_id else None
+        if (
+            known is not None
+            and known.letterboxd_id != film.letterboxd_id
+            and (vid := _viewing(known)) is not None
+            and vid == viewing_id(film.letterboxd_id)
+        ):
+            # Same diary entry as first synced from the other source: keep the page's
+            # ID, so RSS and scraped runs don't keep rewriting it
+            film = film.model_copy(update={"letterboxd_id": known.letterboxd_id})
+
+        properties = film.to_notion_properties()
+        normalized = normalize_properties(properties)
+        digest = fingerprint(normalized)
 
         if existing_page_id:
-            # Update existing page
-            await self.client.update_page(existing_page_id, properties)
-            # Update index
-            self._id_to_page[film.letterboxd_id] = existing_page_id
-            return existing_page_id, "updated"
+            # Send only what differs from the page as last seen
+            if known is not None and known.fingerprint == digest:
+                changed = {}
+            elif existing_page_id in self._page_properties:
+                changed = changed_properties(properties, self._page_properties[existing_page_id])
+            else:
+                changed = properties
+
+            if changed:
+                try:
+                    await self.client.update_page(existing_page_id, changed)
+                except NotionError as e:
+                    if not _page_gone(e):
+                        raise
+                    # Archived or deleted in Notion since the index was loaded (queries
+                    # don't return archived pages, so a cached index can't tell)
+                    self._forget_page(existing_page_id)
+                    if self.state is not None:
+                        self.state.remove([existing_page_id])
+                    return await self._create_page(film, properties, normalized, digest)
+            self._remember(film, existing_page_id, normalized, digest)
+            return existing_page_id, "updated" if changed else "skipped"
         else:
-            # Create new page
-            result = await self.client.create_page(self.database_id, properties)
-            new_id = result["id"]
-            # Update indexes
-            self._id_to_page[film.letterboxd_id] = new_id
-            self._title_to_page[film.title] = new_id
-            return new_id, "created"
+            return await self._create_page(film, properties, normalized, digest)
+
+    async def _create_page(
+        self,
+        film: Film,
+        properties: dict[str, Any],
+        normalized: dict[str, Any],
+        digest: str,
+    ) -> tuple[str, str]:
+        """Create a new page for a film and add it to the indexes."""
+        result = await self.client.create_page(self.database_id, properties)
+        new_id = result["id"]
+        self._remember(film, new_id, normalized, digest)
+        return new_id, "created"
+
+    def _remember(self, film: Film, page_id: str, normalized: dict[str, Any], digest: str) -> None:
+        """Record the content a page is known to have after a sync."""
+        self._page_properties[page_id] = {**self._page_properties.get(page_id, {}), **normalized}
+        # Recorded even when nothing changed, so a refreshed page isn't refreshed again
+        entry = IndexEntry(
+            page_id,
+            film.letterboxd_id,
+            film.title,
+            digest,
+            tmdb_id=film.tmdb_id,
+            backdrop_url=film.backdrop_url,
+            synced_at=datetime.now(UTC),
+        )
+        self._index_page(entry)
+        if self.state is not None:
+            self.state.record(entry)
 
     async def sync_films(
         self,
         films: list[Film],
         on_progress: Callable[[Film, str], None] | None = None,
+        concurrency: int = 1,
     ) -> dict[str, int]:
         """Sync multiple films.
 
+        With ``concurrency > 1`` a pool of that many workers keeps create/update calls
+        in flight at once; the client's rate limiter still bounds the request rate.
+        Progress callbacks then fire in completion order rather than input order,
+        each tagged with the film it belongs to.
+
         Args:
             films: List of films to sync
             on_progress: Optional callback called with (film, action)
+            concurrency: Maximum number of in-flight Notion writes
 
         Returns:
-            Dict with counts: {"created": N, "updated": N}
+            Dict with counts: {"created": N, "updated": N, "skipped": N}
         """
-        counts = {"created": 0, "updated": 0}
+        counts = {"created": 0, "updated": 0, "skipped": 0}
+        pending = iter(films)
+
+        async def worker() -> None:
+            # Workers share one iterator, so each film is claimed exactly once
+            for film in pending:
+                _, action = await self.sync_film(film)
+                counts[action] += 1
 
-        for film in films:
-            _, action = await self.sync_film(film)
-            counts[action] += 1
+                if on_progress:
+                    on_progress(film, action)
 
-            if on_progress:
-                on_progress(film, action)
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(max(1, concurrency)):
+                    tg.create_task(worker())
+        except ExceptionGroup as eg:
+            # Surface the first failure as-is so callers see the same errors as before
+            raise eg.exceptions[0] from None
 
         return counts
 
+    async def archive_pages(
+        self,
+        entries: list[IndexEntry],
+        on_progress: Callable[[IndexEntry], None] | None = None,
+        concurrency: int = 1,
+    ) -> int:
+        """Archive pages in Notion and drop them from the index.
+
+        Runs a pool of ``concurrency`` workers like ``sync_films``; the client's rate
+        limiter bounds the request rate. Each page leaves the local state as soon as
+        it is archived, so an interrupted run keeps the state consistent.
+
+        Returns:
+            Number of pages archived
+        """
+        archived = 0
+        pending = iter(entries)
+
+        async def worker() -> None:
+            nonlocal archived
+            for entry in pending:
+                await self.client.archive_page(entry.page_id)
+                self._forget_page(entry.page_id)
+                if self.state is not None:
+                    self.state.remove([entry.page_id])
+                archived += 1
+
+                if on_progress:
+                    on_progress(entry)
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(max(1, concurrency)):
+                    tg.create_task(worker())
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0] from None
+
+        return archived
+
     @property
     def existing_count(self) -> int:
         """Number of existing pages loaded."""
@@ -0,0 +1,343 @@
+"""Persistent response caches for enrichment lookups."""
+
+import asyncio
+import json
+import sqlite3
+import time
+import unicodedata
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+"""
+
+_HTTP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pending (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL
+);
+"""
+
+# Sentinel for cache misses, since None is a valid (negative) cached value
+MISSING: Any = object()
+
+
+def _open(path: Path | None, schema: str) -> sqlite3.Connection:
+    """Open (or create) a cache database, starting over if the file is corrupt."""
+    if path is None:
+        conn = sqlite3.connect(":memory:")
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path)
+    try:
+        conn.executescript(schema)
+    except sqlite3.DatabaseError:
+        # A corrupt cache is only a cache: start over
+        conn.close()
+        assert path is not None
+        path.unlink(missing_ok=True)
+        conn = sqlite3.connect(path)
+        conn.executescript(schema)
+    return conn
+
+
+class DiskCache:
+    """SQLite key-value store with per-entry expiry and JSON values.
+
+    ``None`` is stored like any other value, which is how negative results are
+    cached. With ``path=None`` the cache lives in memory for the process only.
+    """
+
+    def __init__(self, path: Path | None, namespace: str):
+        self.path = path
+        self.namespace = namespace
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = _open(self.path, _SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get(self, key: str) -> Any:
+        """Get an unexpired value, or ``MISSING``."""
+        row = (
+            self._connect()
+            .execute(
+                "SELECT value FROM entries WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (self.namespace, key, time.time()),
+            )
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else MISSING
+
+    def set(self, key: str, value: Any, ttl: timedelta) -> None:
+        """Store a JSON-serializable value for ``ttl``."""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), time.time() + ttl.total_seconds()),
+            )
+
+
+def normalize_title(title: str) -> str:
+    """Normalize a title for use in cache keys."""
+    return " ".join(unicodedata.normalize("NFKC", title).casefold().split())
+
+
+class TMDBCache:
+    """Cache of TMDB movie lookups with single-flight request coalescing.
+
+    Movies are keyed by TMDB ID and searches by normalized (title, year). Misses
+    ("no such movie" / "no results") are cached for the shorter ``negative_ttl``.
+    Concurrent lookups of the same key share a single in-flight request.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        ttl: timedelta = timedelta(days=30),
+        negative_ttl: timedelta = timedelta(days=1),
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._store = DiskCache(path, "tmdb")
+        self._inflight: dict[str, asyncio.Future[dict[str, Any] | None]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def movie_key(tmdb_id: int) -> str:
+        """Cache key for a lookup by TMDB ID."""
+        return f"movie:{tmdb_id}"
+
+    @staticmethod
+    def search_key(title: str, year: int | None) -> str:
+        """Cache key for a title/year search."""
+        return f"search:{normalize_title(title)}:{year or ''}"
+
+    def close(self) -> None:
+        """Close the underlying store."""
+        self._store.close()
+
+    def put(self, key: str, value: dict[str, Any] | None) -> None:
+        """Store a lookup result (``None`` for a negative result)."""
+        self._store.set(key, value, self.ttl if value is not None else self.negative_ttl)
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[dict[str, Any] | None]],
+    ) -> dict[str, Any] | None:
+        """Return the cached value for ``key``, fetching and storing it on a miss.
+
+        Errors from ``fetch`` are propagated to every waiter and never cached.
+        """
+        while True:
+            value = self._store.get(key)
+            if value is not MISSING:
+                self.hits += 1
+                return value
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                value = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # If only the request we were waiting on was cancelled, try again
+                if not inflight.cancelled():
+                    raise
+                continue
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        future: asyncio.Future[dict[str, Any] | None] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved in case there are none
+            future.exception()
+            raise
+        else:
+            self.put(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+
+
+class ReviewCache:
+    """Review text scraped from Letterboxd review pages, keyed by viewing ID.
+
+    Viewings whose page had no review text are cached (as ``None``) for the
+    shorter ``negative_ttl``.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        ttl: timedelta = timedelta(days=90),
+        negative_ttl: timedelta = timedelta(days=1),
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._store = DiskCache(path, "reviews")
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        """Close the underlying store."""
+        self._store.close()
+
+    def get(self, viewing: str) -> str | None:
+        """Get the cached review text, or ``MISSING``."""
+        value = self._store.get(viewing)
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, viewing: str, text: str | None) -> None:
+        """Store the review text of a viewing (``None`` if its page had none)."""
+        self._store.set(viewing, text, self.ttl if text is not None else self.negative_ttl)
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    """A stored response body with its HTTP validators."""
+
+    etag: str | None
+    last_modified: str | None
+    body: bytes
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Conditional request headers for revalidating this response."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """On-disk cache of response bodies keyed by URL, for conditional requests.
+
+    New responses are staged in a separate table until ``commit()``, which the
+    caller does once the run that consumed them succeeded. A failed or partial run
+    therefore never leaves behind validators that would make the next run see
+    "304 Not Modified" for data that was never synced. Staging on disk rather than
+    in memory keeps long scrapes flat in memory.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        # Responses served from the cache since the last commit or discard
+        self.revalidated = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = _open(self.path, _HTTP_SCHEMA)
+            # Left over from a run that never committed
+            with self._conn:
+                self._conn.execute("DELETE FROM pending")
+        return self._conn
+
+    def close(self) -> None:
+        """Close the underlying database connection, dropping uncommitted responses."""
+        if self._conn is not None:
+            with self._conn:
+                self._conn.execute("DELETE FROM pending")
+            self._conn.close()
+            self._conn = None
+
+    def lookup(self, url: str) -> CachedResponse | None:
+        """Get the latest stored response for ``url``, committed or not."""
+        conn = self._connect()
+        for table in ("pending", "responses"):
+            row = conn.execute(
+                f"SELECT etag, last_modified, body FROM {table} WHERE url = ?", (url,)
+            ).fetchone()
+            if row:
+                return CachedResponse(*row)
+        return None
+
+    def store(self, url: str, response: httpx.Response) -> None:
+        """Stage a successful response if it carries validators."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pending VALUES (?, ?, ?, ?)",
+                    (url, etag, last_modified, response.content),
+                )
+
+    def commit(self) -> None:
+        """Persist the responses staged since the last commit."""
+        conn = self._connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO responses SELECT * FROM pending")
+            conn.execute("DELETE FROM pending")
+        self.revalidated = 0
+
+    def discard(self) -> None:
+        """Drop the responses staged since the last commit."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM pending")
+        self.revalidated = 0
+
+    async def get(self, client: httpx.AsyncClient, url: str, **kwargs: Any) -> httpx.Response:
+        """GET ``url``, revalidating a stored response if there is one.
+
+        A ``304 Not Modified`` is returned as is, with the stored body as its
+        content; a successful response is stored (pending ``commit()``).
+        """
+        cached = self.lookup(url)
+        headers = {**kwargs.pop("headers", {}), **(cached.headers if cached else {})}
+        response = await client.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            self.revalidated += 1
+            return httpx.Response(304, content=cached.body, request=response.request)
+        if response.is_success:
+            self.store(url, response)
+        return response
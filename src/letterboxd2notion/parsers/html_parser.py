@@ -2,20 +2,44 @@
 
 import asyncio
 import re
-from collections.abc import Callable
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Collection
 from datetime import date
+from typing import TYPE_CHECKING
+from urllib.parse import urljoin
 
 import httpx
-from bs4 import BeautifulSoup, Tag
+import lxml.html
 
-from letterboxd2notion.exceptions import RateLimitError
-from letterboxd2notion.models import Film
+from letterboxd2notion import metrics
+from letterboxd2notion.exceptions import ParseError, RateLimitError
+from letterboxd2notion.models import Film, viewing_id
+from letterboxd2notion.parsers.cache import MISSING
+from letterboxd2notion.parsers.rss_parser import review_text
+from letterboxd2notion.ratelimit import TokenBucket, backoff_delay, parse_retry_after
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, Tag
+
+    from letterboxd2notion.journal import SyncJournal
+    from letterboxd2notion.parsers.cache import HTTPCache, ReviewCache
+
+# Trailing "(1990)" on titles like "Home Alone (1990)"
+_TITLE_YEAR_RE = re.compile(r"\s*\((\d{4})\)$")
+# Watch date in day links like /michaelfromyeg/diary/films/for/2025/12/26/
+_WATCHED_DATE_RE = re.compile(r"/for/(\d{4})/(\d{1,2})/(\d{1,2})")
+
+LETTERBOXD_URL = "https://letterboxd.com"
+
+# Letterboxd always serves UTF-8; without this libxml2 would guess Latin-1
+_LXML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
 
 
 async def parse_diary_page(
     client: httpx.AsyncClient,
     diary_url: str,
     page: int = 1,
+    cache: "HTTPCache | None" = None,
 ) -> tuple[list[Film], bool]:
     """Parse a single page of the Letterboxd diary.
 
@@ -23,18 +47,80 @@ async def parse_diary_page(
         client: Async HTTP client
         diary_url: Base diary URL
         page: Page number to fetch
+        cache: Optional HTTP cache; unchanged pages are then served from it
 
     Returns:
         Tuple of (films, has_more_pages)
     """
-    url = f"{diary_url}/page/{page}/"
-    response = await client.get(url, follow_redirects=True)
+    content = await _fetch_diary_page(client, diary_url, page, cache)
+    films, _ = _parse_diary_html(content)
+
+    # Check if there are more pages (empty page means no more)
+    has_more = len(films) > 0
+
+    return films, has_more
+
+
+async def _fetch_diary_page(
+    client: httpx.AsyncClient,
+    diary_url: str,
+    page: int,
+    cache: "HTTPCache | None" = None,
+) -> bytes:
+    """Fetch the raw HTML of a diary page, revalidating a cached copy if any."""
+    return await _fetch_page(client, _page_url(diary_url, page), cache)
+
+
+def _page_url(diary_url: str, page: int) -> str:
+    return f"{diary_url}/page/{page}/"
+
+
+async def _fetch_page(
+    client: httpx.AsyncClient,
+    url: str,
+    cache: "HTTPCache | None" = None,
+) -> bytes:
+    """Fetch the raw HTML of a Letterboxd page, revalidating a cached copy if any."""
+    if cache is not None:
+        # A 304 comes back with the cached body as its content
+        response = await metrics.timed_request(
+            "letterboxd", lambda: cache.get(client, url, follow_redirects=True)
+        )
+        if response.status_code == 304:
+            return response.content
+    else:
+        response = await metrics.timed_request(
+            "letterboxd", lambda: client.get(url, follow_redirects=True)
+        )
 
     if response.status_code == 429:
-        raise RateLimitError()
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        raise RateLimitError(retry_after=int(retry_after) if retry_after is not None else None)
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.content, "html.parser")
+    return response.content
+
+
+def _parse_diary_html(content: bytes, engine: str = "lxml") -> tuple[list[Film], int | None]:
+    """Parse diary page HTML into films and the total page count (if shown).
+
+    Args:
+        content: Raw page HTML
+        engine: "lxml" (fast, default) or "bs4" (reference implementation); both
+            return identical results
+    """
+    with metrics.recorder().stage("parse"):
+        if engine == "bs4":
+            return _parse_diary_html_bs4(content)
+        return _parse_diary_html_lxml(content)
+
+
+def _parse_diary_html_bs4(content: bytes) -> tuple[list[Film], int | None]:
+    """Parse a diary page with BeautifulSoup and CSS selectors."""
+    # Only the reference engine needs bs4, which is slow to import
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, "html.parser")
     films: list[Film] = []
 
     for row in soup.select("tr.diary-entry-row"):
@@ -42,13 +128,20 @@ async def parse_diary_page(
         if film:
             films.append(film)
 
-    # Check if there are more pages (empty page means no more)
-    has_more = len(films) > 0
+    return films, _parse_page_count(soup)
 
-    return films, has_more
 
+def _parse_page_count(soup: "BeautifulSoup") -> int | None:
+    """Read the highest page number from the diary pagination links."""
+    numbers = [
+        int(text)
+        for item in soup.select("div.paginate-pages li.paginate-page")
+        if (text := item.get_text(strip=True)).isdigit()
+    ]
+    return max(numbers) if numbers else None
 
-def _parse_diary_row(row: Tag) -> Film | None:
+
+def _parse_diary_row(row: "Tag") -> Film | None:
     """Parse a single diary table row."""
 
     # Get viewing ID for unique identifier
@@ -68,15 +161,6 @@ def _parse_diary_row(row: Tag) -> Film | None:
     if not title or not slug:
         return None
 
-    # Extract year from title like "Home Alone (1990)"
-    year_match = re.search(r"\((\d{4})\)$", str(title))
-    year = int(year_match.group(1)) if year_match else 0
-
-    # Clean title (remove year)
-    clean_title = re.sub(r"\s*\(\d{4}\)$", "", str(title))
-
-    letterboxd_url = f"https://letterboxd.com/film/{slug}/"
-
     # Get rating from span.rating
     rating = _extract_rating(row)
 
@@ -92,23 +176,51 @@ def _parse_diary_row(row: Tag) -> Film | None:
         and "icon-status-off" not in rewatch_classes
     )
 
-    # Generate letterboxd ID from viewing ID
-    letterboxd_id = f"letterboxd-viewing-{viewing_id}"
+    # Entries with a review link to its page from the review column
+    review_link = row.select_one("td.col-review a[href]")
+    review_href = review_link.get("href") if review_link else None
+
+    return _build_film(
+        str(viewing_id),
+        str(title),
+        str(slug),
+        rating,
+        watched_date,
+        rewatch,
+        review_href if isinstance(review_href, str) else None,
+    )
+
+
+def _build_film(
+    viewing_id: str,
+    title: str,
+    slug: str,
+    rating: float | None,
+    watched_date: date | None,
+    rewatch: bool,
+    review_href: str | None = None,
+) -> Film:
+    """Build a Film from the values extracted from a diary row."""
+    # Split the year off titles like "Home Alone (1990)"
+    year_match = _TITLE_YEAR_RE.search(title)
+    year = int(year_match.group(1)) if year_match else 0
+    clean_title = title[: year_match.start()] + title[year_match.end() :] if year_match else title
 
     return Film(
-        letterboxd_id=letterboxd_id,
+        letterboxd_id=f"letterboxd-viewing-{viewing_id}",
         tmdb_id=None,  # Not available in HTML, needs TMDB search
         title=clean_title,
         year=year,
-        letterboxd_url=letterboxd_url,
+        letterboxd_url=f"https://letterboxd.com/film/{slug}/",
         rating=rating,
         watched_date=watched_date,
         rewatch=rewatch,
-        review=None,  # Would need separate fetch to get review
+        review=None,  # Fetched from review_url separately, see fetch_reviews
+        review_url=urljoin(LETTERBOXD_URL, review_href) if review_href else None,
     )
 
 
-def _extract_rating(row: Tag) -> float | None:
+def _extract_rating(row: "Tag") -> float | None:
     """Extract rating from the row."""
     # Find the rating span with class like "rated-5" or "rated-10"
     rating_span = row.select_one("span.rating[class*='rated-']")
@@ -116,19 +228,26 @@ def _extract_rating(row: Tag) -> float | None:
         classes = rating_span.get("class")
         if not isinstance(classes, list):
             return None
-        for cls in classes:
-            if isinstance(cls, str) and cls.startswith("rated-"):
-                try:
-                    # rated-5 means 2.5 stars (5 half-stars), rated-10 means 5 stars
-                    half_stars = int(cls.replace("rated-", ""))
-                    return half_stars / 2.0
-                except ValueError:
-                    pass
+        return _rating_from_classes(classes)
 
     return None
 
 
-def _extract_watched_date(row: Tag) -> date | None:
+def _rating_from_classes(classes: list[str]) -> float | None:
+    """Convert a "rated-N" class (N half-stars) to a rating."""
+    for cls in classes:
+        if isinstance(cls, str) and cls.startswith("rated-"):
+            try:
+                # rated-5 means 2.5 stars (5 half-stars), rated-10 means 5 stars
+                half_stars = int(cls.replace("rated-", ""))
+                return half_stars / 2.0
+            except ValueError:
+                pass
+
+    return None
+
+
+def _extract_watched_date(row: "Tag") -> date | None:
     """Extract the watch date from the diary row."""
     # Get from the daydate link href like /michaelfromyeg/diary/films/for/2025/12/26/
     day_link = row.select_one("a.daydate")
@@ -139,8 +258,12 @@ def _extract_watched_date(row: Tag) -> date | None:
     if not isinstance(href, str):
         return None
 
-    # Extract date from href
-    match = re.search(r"/for/(\d{4})/(\d{1,2})/(\d{1,2})", href)
+    return _date_from_href(href)
+
+
+def _date_from_href(href: str) -> date | None:
+    """Extract the watch date from a day link href."""
+    match = _WATCHED_DATE_RE.search(href)
     if match:
         try:
             return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
@@ -150,40 +273,388 @@ def _extract_watched_date(row: Tag) -> date | None:
     return None
 
 
+def _parse_diary_html_lxml(content: bytes) -> tuple[list[Film], int | None]:
+    """Parse a diary page with lxml, mirroring the BeautifulSoup selectors.
+
+    Rows and pagination items are found in one pass over the tree, and each row
+    in one pass over its descendants, instead of a CSS query per field.
+    """
+    root = lxml.html.fromstring(content, parser=_LXML_PARSER)
+    films: list[Film] = []
+    page_numbers: list[int] = []
+
+    for element in root.iter("tr", "li"):
+        classes = (element.get("class") or "").split()
+        if element.tag == "tr":
+            if "diary-entry-row" in classes:
+                film = _parse_diary_row_lxml(element)
+                if film:
+                    films.append(film)
+        elif "paginate-page" in classes and any(
+            parent.tag == "div" and "paginate-pages" in (parent.get("class") or "").split()
+            for parent in element.iterancestors()
+        ):
+            text = "".join(part.strip() for part in element.itertext())
+            if text.isdigit():
+                page_numbers.append(int(text))
+
+    return films, max(page_numbers) if page_numbers else None
+
+
+def _parse_diary_row_lxml(row: lxml.html.HtmlElement) -> Film | None:
+    """Parse a single diary table row (lxml engine)."""
+    viewing_id = row.get("data-viewing-id")
+    if not viewing_id:
+        return None
+
+    # First match of each selector, in document order, as select_one would find
+    poster_div = rating_span = day_link = rewatch_td = review_td = None
+    for element in row.iter("div", "span", "a", "td"):
+        class_attr = element.get("class")
+        if not class_attr:
+            continue
+        classes = class_attr.split()
+        tag = element.tag
+        if tag == "div":
+            if (
+                poster_div is None
+                and "react-component" in classes
+                and element.get("data-item-slug") is not None
+            ):
+                poster_div = element
+        elif tag == "span":
+            if rating_span is None and "rating" in classes and "rated-" in class_attr:
+                rating_span = element
+        elif tag == "a":
+            if day_link is None and "daydate" in classes:
+                day_link = element
+        elif tag == "td":
+            if rewatch_td is None and "col-rewatch" in classes:
+                rewatch_td = element
+            elif review_td is None and "col-review" in classes:
+                review_td = element
+
+    if poster_div is None:
+        return None
+
+    title = poster_div.get("data-item-name", "")
+    slug = poster_div.get("data-item-slug", "")
+    if not title or not slug:
+        return None
+
+    rating = (
+        _rating_from_classes(rating_span.get("class", "").split())
+        if rating_span is not None
+        else None
+    )
+    watched_date = _date_from_href(day_link.get("href", "")) if day_link is not None else None
+    rewatch = (
+        rewatch_td is not None and "icon-status-off" not in rewatch_td.get("class", "").split()
+    )
+    review_href = (
+        next((a.get("href") for a in review_td.iter("a") if a.get("href") is not None), None)
+        if review_td is not None
+        else None
+    )
+
+    return _build_film(viewing_id, title, slug, rating, watched_date, rewatch, review_href)
+
+
+async def fetch_reviews(
+    client: httpx.AsyncClient,
+    films: list[Film],
+    limiter: TokenBucket,
+    cache: "ReviewCache | None" = None,
+    concurrency: int = 4,
+    max_retries: int = 3,
+) -> list[Film]:
+    """Fill in the review text of films whose diary row links to a review.
+
+    The diary only shows that an entry has a review; its text is on the review
+    page, fetched here under ``limiter``, ``concurrency`` at a time. With a cache,
+    each viewing's review is only fetched once. A review page that cannot be
+    fetched after retries leaves its film without review text, and uncached, so
+    the next sync tries again.
+
+    Returns:
+        The films, in the same order, with ``review`` set where one was found
+    """
+    results = list(films)
+    todo = [
+        (index, film, url)
+        for index, film in enumerate(films)
+        if (url := film.review_url) and film.review is None
+    ]
+    if not todo:
+        return results
+    pending = iter(todo)
+
+    async def worker() -> None:
+        for index, film, url in pending:
+            viewing = viewing_id(film.letterboxd_id) or film.letterboxd_id
+            text = cache.get(viewing) if cache is not None else MISSING
+            if text is MISSING:
+                try:
+                    content = await _fetch_with_retries(client, url, limiter, max_retries, what=url)
+                except ParseError:
+                    continue
+                text = _parse_review_html(content)
+                if cache is not None:
+                    cache.put(viewing, text)
+            if text:
+                results[index] = film.model_copy(update={"review": text})
+
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(max(1, concurrency)):
+            tg.create_task(worker())
+
+    return results
+
+
+def _parse_review_html(content: bytes) -> str | None:
+    """Extract the review text from a review page (``div.review.body-text``)."""
+    with metrics.recorder().stage("parse"):
+        root = lxml.html.fromstring(content, parser=_LXML_PARSER)
+        for element in root.iter("div"):
+            classes = (element.get("class") or "").split()
+            if "review" in classes and "body-text" in classes:
+                return review_text(element)
+    return None
+
+
 async def parse_all_diary_pages(
     client: httpx.AsyncClient,
     diary_url: str,
     on_page: Callable[[int], None] | None = None,
+    concurrency: int = 4,
+    limiter: TokenBucket | None = None,
+    max_retries: int = 3,
+    cache: "HTTPCache | None" = None,
 ) -> list[Film]:
     """Parse all diary pages for full sync.
 
+    See ``iter_diary_films``, which this collects.
+
+    Returns:
+        List of all films from all pages, in diary order (newest first)
+
+    Raises:
+        ParseError: If a page still cannot be fetched after retries
+    """
+    return [
+        film
+        async for film in iter_diary_films(
+            client, diary_url, on_page, concurrency, limiter, max_retries, cache
+        )
+    ]
+
+
+async def iter_diary_films(
+    client: httpx.AsyncClient,
+    diary_url: str,
+    on_page: Callable[[int], None] | None = None,
+    concurrency: int = 4,
+    limiter: TokenBucket | None = None,
+    max_retries: int = 3,
+    cache: "HTTPCache | None" = None,
+    journal: "SyncJournal | None" = None,
+    reviews: bool = False,
+    review_cache: "ReviewCache | None" = None,
+) -> AsyncIterator[Film]:
+    """Yield all diary films, in diary order, while later pages are still loading.
+
+    The first page's pagination gives the total page count; the following pages
+    are then fetched in a window of up to ``concurrency`` pages ahead of the one
+    being consumed, so a slow consumer holds back the scrape instead of letting
+    pages pile up. Without pagination links the pages are walked one by one until
+    an empty one.
+
     Args:
         client: Async HTTP client
         diary_url: Base diary URL
         on_page: Optional callback called with page number
-
-    Returns:
-        List of all films from all pages
+        concurrency: Maximum number of pages fetched at once
+        limiter: Rate limiter for page requests (default: one request every 2s)
+        max_retries: Retries per page for throttling and transient errors
+        cache: Optional HTTP cache; unchanged pages are then served from it
+        journal: Optional progress journal; pages it already holds are not fetched
+            again, and newly parsed pages are recorded in it
+        reviews: Fetch the text of reviews linked from the diary (see ``fetch_reviews``)
+        review_cache: Optional cache of review text by viewing ID
+
+    Raises:
+        ParseError: If a page still cannot be fetched after retries
     """
-    all_films: list[Film] = []
-    page = 1
+    if limiter is None:
+        limiter = TokenBucket(0.5)
 
-    while True:
+    async def fetch(page: int) -> tuple[list[Film], int | None]:
+        if journal is not None and (recorded := journal.page(page)) is not None:
+            return recorded
         if on_page:
             on_page(page)
+        content = await _fetch_with_retries(
+            client, _page_url(diary_url, page), limiter, max_retries, cache, f"diary page {page}"
+        )
+        films, page_count = _parse_diary_html(content)
+        if reviews:
+            films = await fetch_reviews(
+                client, films, limiter, review_cache, concurrency, max_retries
+            )
+        if journal is not None:
+            journal.record_page(page, films, page_count)
+        return films, page_count
+
+    # New entries logged mid-scrape shift rows onto the next page, so drop repeats
+    seen: set[str] = set()
+
+    def unseen(films: list[Film]) -> list[Film]:
+        fresh = [film for film in films if film.letterboxd_id not in seen]
+        seen.update(film.letterboxd_id for film in fresh)
+        return fresh
+
+    first, page_count = await fetch(1)
+    for film in unseen(first):
+        yield film
+    if not first:
+        return
+
+    if page_count is None:
+        # No pagination shown: walk pages until an empty one
+        page = 2
+        while films := (await fetch(page))[0]:
+            for film in unseen(films):
+                yield film
+            page += 1
+        return
+
+    window: deque[asyncio.Task[tuple[list[Film], int | None]]] = deque()
+    next_page = 2
+    try:
+        while window or next_page <= page_count:
+            while next_page <= page_count and len(window) < max(1, concurrency):
+                window.append(asyncio.create_task(fetch(next_page)))
+                next_page += 1
+            films, _ = await window.popleft()
+            for film in unseen(films):
+                yield film
+    finally:
+        for task in window:
+            task.cancel()
+        await asyncio.gather(*window, return_exceptions=True)
+
+
+async def iter_new_diary_films(
+    client: httpx.AsyncClient,
+    diary_url: str,
+    known_ids: Collection[str],
+    stop_streak: int = 10,
+    on_page: Callable[[int], None] | None = None,
+    limiter: TokenBucket | None = None,
+    max_retries: int = 3,
+    cache: "HTTPCache | None" = None,
+    reviews: bool = False,
+    review_cache: "ReviewCache | None" = None,
+    concurrency: int = 4,
+) -> AsyncIterator[Film]:
+    """Yield diary films newest-first until reaching already-synced history.
+
+    Pages are fetched one at a time, stopping after a page whose rows are all
+    known, or once ``stop_streak`` known rows have been seen in a row. Known rows
+    on the pages fetched are yielded too, so recent edits are still picked up.
 
-        films, has_more = await parse_diary_page(client, diary_url, page)
-
-        if not films:
-            break
+    Args:
+        client: Async HTTP client
+        diary_url: Base diary URL
+        known_ids: Viewing numbers already synced (see ``models.viewing_id``)
+        stop_streak: Consecutive known rows that end the scrape
+        on_page: Optional callback called with page number
+        limiter: Rate limiter for page requests (default: one request every 2s)
+        max_retries: Retries per page for throttling and transient errors
+        cache: Optional HTTP cache; unchanged pages are then served from it
+        reviews: Fetch the text of reviews linked from the diary (see ``fetch_reviews``)
+        review_cache: Optional cache of review text by viewing ID
+        concurrency: Maximum number of review pages fetched at once
+
+    Raises:
+        ParseError: If a page still cannot be fetched after retries
+    """
+    if limiter is None:
+        limiter = TokenBucket(0.5)
 
-        all_films.extend(films)
-        page += 1
+    seen: set[str] = set()
+    streak = 0
+    page = 1
+    page_count: int | None = None
 
-        if not has_more:
+    while page_count is None or page <= page_count:
+        if on_page:
+            on_page(page)
+        content = await _fetch_with_retries(
+            client, _page_url(diary_url, page), limiter, max_retries, cache, f"diary page {page}"
+        )
+        page_films, count = _parse_diary_html(content)
+        if not page_films:
+            break
+        if reviews:
+            page_films = await fetch_reviews(
+                client, page_films, limiter, review_cache, concurrency, max_retries
+            )
+        page_count = count or page_count
+
+        all_known = True
+        caught_up = False
+        for film in page_films:
+            if film.letterboxd_id in seen:
+                continue
+            seen.add(film.letterboxd_id)
+            if viewing_id(film.letterboxd_id) in known_ids:
+                streak += 1
+                caught_up = caught_up or streak >= stop_streak
+            else:
+                streak = 0
+                all_known = False
+            yield film
+
+        if all_known or caught_up:
             break
+        page += 1
 
-        # Respect rate limits
-        await asyncio.sleep(2)
 
-    return all_films
+async def _fetch_with_retries(
+    client: httpx.AsyncClient,
+    url: str,
+    limiter: TokenBucket,
+    max_retries: int,
+    cache: "HTTPCache | None" = None,
+    what: str = "page",
+) -> bytes:
+    """Fetch a Letterboxd page under the rate limiter, retrying transient failures.
+
+    Raises:
+        ParseError: Naming ``what`` was fetched, if it still failed after retries
+    """
+    recorder = metrics.recorder()
+    for attempt in range(max_retries + 1):
+        recorder.observe_wait("letterboxd", await limiter.acquire())
+        try:
+            content = await _fetch_page(client, url, cache)
+        except RateLimitError as e:
+            limiter.on_throttle(e.retry_after)
+            error: Exception = e
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500:
+                raise ParseError(f"Failed to fetch {what}: {e}") from e
+            error = e
+        else:
+            limiter.on_success()
+            return content
+        if attempt < max_retries:
+            recorder.observe_retry("letterboxd")
+            # A throttled request waits in the limiter instead
+            if not isinstance(error, RateLimitError):
+                delay = backoff_delay(attempt)
+                recorder.observe_wait("letterboxd", delay)
+                await asyncio.sleep(delay)
+
+    raise ParseError(f"Failed to fetch {what}: {error}") from error
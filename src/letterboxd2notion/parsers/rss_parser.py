@@ -1,14 +1,21 @@
 """RSS feed parser for Letterboxd."""
 
+from collections.abc import AsyncIterator, Iterable, Iterator
 from datetime import date
+from typing import TYPE_CHECKING
 from xml.etree import ElementTree as ET
 
 import httpx
-from bs4 import BeautifulSoup
+import lxml.etree
+import lxml.html
 
-from letterboxd2notion.exceptions import ParseError, RateLimitError
+from letterboxd2notion import metrics
+from letterboxd2notion.exceptions import NotModifiedError, ParseError, RateLimitError
 from letterboxd2notion.models import Film
 
+if TYPE_CHECKING:
+    from letterboxd2notion.parsers.cache import HTTPCache
+
 # RSS namespace mappings
 NAMESPACES = {
     "letterboxd": "https://letterboxd.com",
@@ -16,90 +23,176 @@ NAMESPACES = {
     "dc": "http://purl.org/dc/elements/1.1/",
 }
 
+# Item child tags in ElementTree's "{namespace}name" notation
+_FILM_TITLE = f"{{{NAMESPACES['letterboxd']}}}filmTitle"
+_FILM_YEAR = f"{{{NAMESPACES['letterboxd']}}}filmYear"
+_MEMBER_RATING = f"{{{NAMESPACES['letterboxd']}}}memberRating"
+_WATCHED_DATE = f"{{{NAMESPACES['letterboxd']}}}watchedDate"
+_REWATCH = f"{{{NAMESPACES['letterboxd']}}}rewatch"
+_MOVIE_ID = f"{{{NAMESPACES['tmdb']}}}movieId"
+
+# Elements whose text is not part of a paragraph's visible text
+_NON_TEXT_TAGS = ("script", "style", "template")
+
 
 async def parse_rss_feed(
     client: httpx.AsyncClient,
     rss_url: str,
+    cache: "HTTPCache | None" = None,
 ) -> list[Film]:
     """Parse Letterboxd RSS feed into Film objects.
 
     Args:
         client: Async HTTP client
         rss_url: URL to Letterboxd RSS feed
+        cache: Optional HTTP cache; the feed is then fetched conditionally
 
     Returns:
         List of Film objects parsed from feed
 
     Raises:
+        NotModifiedError: If the feed is unchanged since it was cached
         ParseError: If RSS cannot be parsed
         RateLimitError: If rate limited by Letterboxd
     """
-    response = await client.get(rss_url)
+    content = await _fetch_rss(client, rss_url, cache)
+    with metrics.recorder().stage("parse"):
+        return parse_rss_content(content)
+
+
+async def iter_rss_feed(
+    client: httpx.AsyncClient,
+    rss_url: str,
+    cache: "HTTPCache | None" = None,
+) -> AsyncIterator[Film]:
+    """Fetch a Letterboxd RSS feed and yield its films as they are parsed.
+
+    Raises the same errors as ``parse_rss_feed``, on the first iteration.
+    """
+    content = await _fetch_rss(client, rss_url, cache)
+    films = iter_rss_films([content])
+    while True:
+        with metrics.recorder().stage("parse"):
+            film = next(films, None)
+        if film is None:
+            return
+        yield film
+
+
+async def _fetch_rss(
+    client: httpx.AsyncClient,
+    rss_url: str,
+    cache: "HTTPCache | None",
+) -> bytes:
+    """Fetch the raw XML of an RSS feed, conditionally if there is a cache."""
+    if cache is not None:
+        response = await metrics.timed_request("letterboxd", lambda: cache.get(client, rss_url))
+        if response.status_code == 304:
+            raise NotModifiedError(rss_url)
+    else:
+        response = await metrics.timed_request("letterboxd", lambda: client.get(rss_url))
 
     if response.status_code == 429:
         raise RateLimitError(retry_after=int(response.headers.get("Retry-After", 60)))
     response.raise_for_status()
 
+    return response.content
+
+
+def parse_rss_content(content: bytes) -> list[Film]:
+    """Parse the XML of a Letterboxd RSS feed into Film objects.
+
+    Raises:
+        ParseError: If RSS cannot be parsed
+    """
+    return list(iter_rss_films([content]))
+
+
+def iter_rss_films(chunks: Iterable[bytes]) -> Iterator[Film]:
+    """Incrementally parse RSS XML, yielding films as their items complete.
+
+    Items are detached from the tree once parsed, so memory stays flat for large
+    multi-user feeds or archived feed dumps read in chunks, e.g.
+    ``iter(partial(file.read, 1 << 16), b"")``.
+
+    Raises:
+        ParseError: If RSS cannot be parsed
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    # Open elements, so a finished item can be removed from its parent
+    stack: list[ET.Element] = []
+
     try:
-        root = ET.fromstring(response.content)
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from _read_items(parser, stack)
+        parser.close()
+        yield from _read_items(parser, stack)
     except ET.ParseError as e:
         raise ParseError(f"Failed to parse RSS XML: {e}") from e
 
-    films: list[Film] = []
 
-    for item in root.findall(".//item"):
-        film = _parse_rss_item(item)
-        if film:
-            films.append(film)
+def _read_items(parser: ET.XMLPullParser, stack: list[ET.Element]) -> Iterator[Film]:
+    """Yield films for the items completed in the parser's pending events."""
+    for event, element in parser.read_events():
+        if event == "start":
+            stack.append(element)
+            continue
 
-    return films
+        stack.pop()
+        if element.tag != "item":
+            continue
+        film = _parse_rss_item(element)
+        if stack:
+            stack[-1].remove(element)
+        if film:
+            yield film
 
 
 def _parse_rss_item(item: ET.Element) -> Film | None:
     """Parse a single RSS item into a Film object."""
 
+    # One pass over the item's children; like find(), the first of a tag wins
+    fields: dict[str, str | None] = {}
+    for child in item:
+        fields.setdefault(child.tag, child.text)
+
     # Extract guid (letterboxd-review-XXXXXXXXX)
-    guid_elem = item.find("guid")
-    if guid_elem is None or guid_elem.text is None:
+    letterboxd_id = fields.get("guid")
+    if letterboxd_id is None:
         return None
-    letterboxd_id = guid_elem.text
 
     # Extract film title
-    title_elem = item.find("letterboxd:filmTitle", NAMESPACES)
-    if title_elem is None or title_elem.text is None:
+    title = fields.get(_FILM_TITLE)
+    if title is None:
         return None
-    title = title_elem.text
 
     # Extract film year
-    year_elem = item.find("letterboxd:filmYear", NAMESPACES)
-    if year_elem is None or year_elem.text is None:
+    year_text = fields.get(_FILM_YEAR)
+    if year_text is None:
         return None
-    year = int(year_elem.text)
+    year = int(year_text)
 
     # Extract link/URL
-    link_elem = item.find("link")
-    letterboxd_url = link_elem.text if link_elem is not None and link_elem.text else ""
+    letterboxd_url = fields.get("link") or ""
 
     # Extract rating (optional)
-    rating_elem = item.find("letterboxd:memberRating", NAMESPACES)
-    rating = float(rating_elem.text) if rating_elem is not None and rating_elem.text else None
+    rating_text = fields.get(_MEMBER_RATING)
+    rating = float(rating_text) if rating_text else None
 
     # Extract watched date (optional)
-    watched_elem = item.find("letterboxd:watchedDate", NAMESPACES)
-    watched_date = None
-    if watched_elem is not None and watched_elem.text:
-        watched_date = date.fromisoformat(watched_elem.text)
+    watched_text = fields.get(_WATCHED_DATE)
+    watched_date = date.fromisoformat(watched_text) if watched_text else None
 
     # Extract rewatch flag
-    rewatch_elem = item.find("letterboxd:rewatch", NAMESPACES)
-    rewatch = rewatch_elem is not None and rewatch_elem.text == "Yes"
+    rewatch = fields.get(_REWATCH) == "Yes"
 
     # Extract TMDB ID
-    tmdb_elem = item.find("tmdb:movieId", NAMESPACES)
-    tmdb_id = int(tmdb_elem.text) if tmdb_elem is not None and tmdb_elem.text else None
+    tmdb_text = fields.get(_MOVIE_ID)
+    tmdb_id = int(tmdb_text) if tmdb_text else None
 
     # Extract review text from description
-    review = _extract_review_from_description(item)
+    review = _extract_review_from_description(fields.get("description"))
 
     return Film(
         letterboxd_id=letterboxd_id,
@@ -114,7 +207,7 @@ def _parse_rss_item(item: ET.Element) -> Film | None:
     )
 
 
-def _extract_review_from_description(item: ET.Element) -> str | None:
+def _extract_review_from_description(description: str | None) -> str | None:
     """Extract review text from RSS description field.
 
     The description contains HTML like:
@@ -122,25 +215,32 @@ def _extract_review_from_description(item: ET.Element) -> str | None:
     <p>First paragraph of review</p>
     <p>Second paragraph</p>
     """
-    desc_elem = item.find("description")
-    if desc_elem is None or desc_elem.text is None:
+    if description is None:
         return None
 
-    soup = BeautifulSoup(desc_elem.text, "lxml")
+    try:
+        root = lxml.html.document_fromstring(description)
+    except lxml.etree.ParserError:
+        # Blank description
+        return None
+    return review_text(root)
 
-    # Find all paragraphs
-    paragraphs = soup.find_all("p")
+
+def review_text(root: lxml.html.HtmlElement) -> str | None:
+    """Join the visible text of the review paragraphs under ``root``.
+
+    Shared by the RSS description and the review pages scraped during full syncs,
+    so a review reads the same whichever way it was synced.
+    """
+    lxml.etree.strip_elements(root, *_NON_TEXT_TAGS, with_tail=False)
 
     review_parts: list[str] = []
-    for p in paragraphs:
-        # Skip paragraphs that only contain an image
-        if p.find("img") and not p.get_text(strip=True):
-            continue
-        # Skip spoiler warning
-        text = p.get_text(strip=True)
-        if text.startswith("This review may contain spoilers"):
+    for p in root.iter("p"):
+        # Visible text with each string stripped, comments excluded
+        text = "".join(part.strip() for part in p.itertext())
+        # Skip image-only paragraphs (no text) and the spoiler warning
+        if not text or text.startswith("This review may contain spoilers"):
             continue
-        if text:
-            review_parts.append(text)
+        review_parts.append(text)
 
     return "\n\n".join(review_parts) if review_parts else None
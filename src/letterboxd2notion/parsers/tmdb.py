@@ -0,0 +1,202 @@
+"""TMDB lookups that add backdrop and poster images to films."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import httpx
+
+from letterboxd2notion import metrics
+from letterboxd2notion.exceptions import TMDBError
+from letterboxd2notion.models import Film
+from letterboxd2notion.parsers.cache import TMDBCache
+from letterboxd2notion.ratelimit import TokenBucket, backoff_delay, parse_retry_after
+
+TMDB_BASE_URL = "https://api.themoviedb.org/3"
+TMDB_IMAGE_BASE = "https://image.tmdb.org/t/p"
+
+
+async def enrich_film_with_tmdb(
+    client: httpx.AsyncClient,
+    film: Film,
+    api_key: str,
+    cache: TMDBCache | None = None,
+    limiter: TokenBucket | None = None,
+) -> Film:
+    """Enrich a Film with TMDB backdrop/poster URLs.
+
+    If tmdb_id is available (from RSS), fetches directly by ID.
+    Otherwise, searches by title and year. With a cache, repeated lookups
+    (including ones that found nothing) are answered without a request;
+    requests that do go out wait on ``limiter`` first.
+    """
+    if film.tmdb_id:
+        tmdb_id = film.tmdb_id
+        movie_data = await _cached(
+            cache,
+            TMDBCache.movie_key(tmdb_id),
+            lambda: _fetch_movie_by_id(client, tmdb_id, api_key, limiter),
+        )
+    else:
+        movie_data = await _cached(
+            cache,
+            TMDBCache.search_key(film.title, film.year),
+            lambda: _search_movie(client, film.title, film.year, api_key, limiter),
+        )
+        # A search hit carries everything a lookup by ID would return
+        if cache is not None and movie_data is not None and movie_data.get("id"):
+            cache.put(TMDBCache.movie_key(movie_data["id"]), movie_data)
+
+    if movie_data is None:
+        return film
+
+    backdrop_path = movie_data.get("backdrop_path")
+    poster_path = movie_data.get("poster_path")
+
+    return film.model_copy(
+        update={
+            "backdrop_url": f"{TMDB_IMAGE_BASE}/w1280{backdrop_path}" if backdrop_path else None,
+            "poster_url": f"{TMDB_IMAGE_BASE}/w500{poster_path}" if poster_path else None,
+            "tmdb_id": movie_data.get("id") if film.tmdb_id is None else film.tmdb_id,
+        }
+    )
+
+
+async def enrich_films(
+    client: httpx.AsyncClient,
+    films: list[Film],
+    api_key: str,
+    cache: TMDBCache | None = None,
+    limiter: TokenBucket | None = None,
+    concurrency: int = 8,
+    on_film: Callable[[Film, Exception | None], None] | None = None,
+) -> list[Film]:
+    """Enrich many films concurrently, keeping their order.
+
+    A pool of ``concurrency`` workers shares the films; ``limiter`` bounds the
+    overall TMDB request rate. A film whose lookup fails is passed through
+    unenriched rather than failing the whole batch.
+
+    Args:
+        client: Async HTTP client
+        films: Films to enrich
+        api_key: TMDB API key
+        cache: Optional TMDB lookup cache
+        limiter: Optional rate limiter for TMDB requests
+        concurrency: Number of concurrent workers
+        on_film: Optional callback called with (film, error) as each film completes
+
+    Returns:
+        Enriched films, in the same order as ``films``
+    """
+    results = list(films)
+    pending = iter(enumerate(films))
+
+    async def worker() -> None:
+        for index, film in pending:
+            error: Exception | None = None
+            try:
+                results[index] = await enrich_film_with_tmdb(client, film, api_key, cache, limiter)
+            except Exception as e:
+                error = e
+            if on_film:
+                on_film(film, error)
+
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(max(1, concurrency)):
+            tg.create_task(worker())
+
+    return results
+
+
+async def _cached(
+    cache: TMDBCache | None,
+    key: str,
+    fetch: Callable[[], Awaitable[dict | None]],
+) -> dict | None:
+    """Run a TMDB lookup through the cache, keeping only the fields we use."""
+
+    async def fetch_slim() -> dict | None:
+        return _slim(await fetch())
+
+    if cache is None:
+        return await fetch_slim()
+    return await cache.get_or_fetch(key, fetch_slim)
+
+
+def _slim(movie_data: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Reduce a TMDB movie object to the fields used for enrichment."""
+    if movie_data is None:
+        return None
+    return {key: movie_data.get(key) for key in ("id", "backdrop_path", "poster_path")}
+
+
+async def _tmdb_get(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict[str, str],
+    limiter: TokenBucket | None,
+    max_retries: int = 3,
+) -> httpx.Response:
+    """GET a TMDB endpoint under the rate limiter, retrying when throttled."""
+    recorder = metrics.recorder()
+    for attempt in range(max_retries + 1):
+        if limiter is not None:
+            recorder.observe_wait("tmdb", await limiter.acquire())
+        response = await metrics.timed_request("tmdb", lambda: client.get(url, params=params))
+        if response.status_code != 429 or attempt == max_retries:
+            break
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if limiter is not None:
+            limiter.on_throttle(retry_after)
+        delay = retry_after if retry_after is not None else backoff_delay(attempt)
+        recorder.observe_wait("tmdb", delay)
+        recorder.observe_retry("tmdb")
+        await asyncio.sleep(delay)
+
+    if limiter is not None and response.status_code != 429:
+        limiter.on_success()
+    return response
+
+
+async def _fetch_movie_by_id(
+    client: httpx.AsyncClient,
+    tmdb_id: int,
+    api_key: str,
+    limiter: TokenBucket | None = None,
+) -> dict | None:
+    """Fetch movie details by TMDB ID."""
+    url = f"{TMDB_BASE_URL}/movie/{tmdb_id}"
+    response = await _tmdb_get(client, url, {"api_key": api_key}, limiter)
+
+    if response.status_code == 404:
+        return None
+    if response.status_code != 200:
+        raise TMDBError(f"TMDB API error: {response.status_code}")
+
+    return response.json()
+
+
+async def _search_movie(
+    client: httpx.AsyncClient,
+    title: str,
+    year: int | None,
+    api_key: str,
+    limiter: TokenBucket | None = None,
+) -> dict | None:
+    """Search for movie by title, optionally filtering by year."""
+    url = f"{TMDB_BASE_URL}/search/movie"
+    params: dict[str, str] = {"api_key": api_key, "query": title}
+    if year:
+        params["year"] = str(year)
+
+    response = await _tmdb_get(client, url, params, limiter)
+
+    if response.status_code != 200:
+        raise TMDBError(f"TMDB search error: {response.status_code}")
+
+    data = response.json()
+    results = data.get("results", [])
+
+    return results[0] if results else None
@@ -0,0 +1,109 @@
+"""Streaming sync pipeline: scrape -> enrich -> write, connected by bounded queues."""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing
+from typing import Any
+
+from letterboxd2notion.models import Film
+
+# End-of-stream marker passed down the queues
+_DONE: Any = object()
+
+
+async def primed(source: AsyncIterator[Film]) -> AsyncIterator[Film]:
+    """Start ``source`` right away and return an iterator over all of its films.
+
+    Pulling the first film up front surfaces early failures (an unchanged feed, a
+    first page that cannot be fetched) before any downstream work begins.
+    """
+    try:
+        first = await anext(source)
+    except StopAsyncIteration:
+        await source.aclose()
+        first = _DONE
+
+    async def chained() -> AsyncIterator[Film]:
+        if first is _DONE:
+            return
+        yield first
+        async with aclosing(source):
+            async for film in source:
+                yield film
+
+    return chained()
+
+
+async def run_pipeline(
+    source: AsyncIterator[Film],
+    enrich: Callable[[Film], Awaitable[Film]],
+    write: Callable[[Film], Awaitable[str]],
+    enrich_concurrency: int = 8,
+    write_concurrency: int = 4,
+    queue_size: int = 32,
+    limit: int | None = None,
+) -> dict[str, int]:
+    """Stream films from ``source`` through ``enrich`` into ``write``.
+
+    Each stage runs as its own pool of tasks, handing films on through a queue of
+    at most ``queue_size``. Writes start as soon as the first film is enriched, and
+    a stage that falls behind blocks the ones before it, so memory use stays flat
+    however many films the source yields. Films are written in completion order.
+
+    Args:
+        source: Films to sync (the source is closed when the pipeline ends)
+        enrich: Called with each film; returns the film to write
+        write: Called with each enriched film; returns the action taken
+        enrich_concurrency: Number of concurrent enrichment workers
+        write_concurrency: Number of concurrent writers
+        queue_size: Capacity of each queue between stages
+        limit: Stop after this many films from the source
+
+    Returns:
+        Dict counting the actions returned by ``write``, e.g. {"created": N, ...}
+    """
+    to_enrich: asyncio.Queue[Film] = asyncio.Queue(queue_size)
+    to_write: asyncio.Queue[Film] = asyncio.Queue(queue_size)
+    enrich_workers = max(1, enrich_concurrency)
+    write_workers = max(1, write_concurrency)
+    enrichers_left = enrich_workers
+    counts: dict[str, int] = {"created": 0, "updated": 0, "skipped": 0}
+
+    async def produce() -> None:
+        async with aclosing(source):
+            count = 0
+            async for film in source:
+                await to_enrich.put(film)
+                count += 1
+                if limit is not None and count >= limit:
+                    break
+        for _ in range(enrich_workers):
+            await to_enrich.put(_DONE)
+
+    async def enricher() -> None:
+        nonlocal enrichers_left
+        while (film := await to_enrich.get()) is not _DONE:
+            await to_write.put(await enrich(film))
+        # The last enricher to finish tells the writers
+        enrichers_left -= 1
+        if enrichers_left == 0:
+            for _ in range(write_workers):
+                await to_write.put(_DONE)
+
+    async def writer() -> None:
+        while (film := await to_write.get()) is not _DONE:
+            action = await write(film)
+            counts[action] = counts.get(action, 0) + 1
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(produce())
+            for _ in range(enrich_workers):
+                tg.create_task(enricher())
+            for _ in range(write_workers):
+                tg.create_task(writer())
+    except ExceptionGroup as eg:
+        # Surface the first failure as-is, like the other worker pools
+        raise eg.exceptions[0] from None
+
+    return counts
@@ -0,0 +1,99 @@
+"""Adaptive rate limiting shared by the API clients."""
+
+import asyncio
+import math
+import random
+import time
+
+
+class TokenBucket:
+    """Token bucket rate limiter with AIMD rate adaptation.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``, so short
+    bursts go out immediately while the long-run rate stays bounded. When the server
+    throttles us the rate is cut multiplicatively (and paused for ``Retry-After``);
+    every successful request then adds a small fixed step back, up to ``max_rate``.
+    An infinite ``rate`` never waits, except for a ``Retry-After`` pause.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        *,
+        max_rate: float | None = None,
+        min_rate: float | None = None,
+        increase: float | None = None,
+        decrease: float = 0.5,
+    ):
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.rate = min(rate, self.max_rate)
+        self.capacity = max(1.0, capacity)
+        # Recover from a halving in roughly a few dozen successful requests
+        self.increase = increase if increase is not None else self.max_rate / 20
+        self.decrease = decrease
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Wait for a token and take it.
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                if self.rate == math.inf:
+                    return time.monotonic() - start
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return time.monotonic() - start
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def on_success(self) -> None:
+        """Additive increase after a request the server accepted."""
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        """Multiplicative decrease after the server throttled a request."""
+        now = time.monotonic()
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self._tokens = 0.0
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+
+def rate_for_delay(delay: float) -> float:
+    """Requests per second for a delay between requests, where 0 means no limit."""
+    return 1 / delay if delay > 0 else math.inf
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter for the given (zero-based) retry attempt."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header given in seconds; HTTP dates are ignored."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
@@ -0,0 +1,215 @@
+"""Persistent local sync state (SQLite) mirroring the Notion database index."""
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+# Bump when the table layout changes; older files are then rebuilt from Notion
+SCHEMA_VERSION = "2"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    page_id TEXT PRIMARY KEY,
+    letterboxd_id TEXT,
+    title TEXT,
+    fingerprint TEXT,
+    tmdb_id INTEGER,
+    backdrop_url TEXT,
+    synced_at TEXT NOT NULL
+);
+"""
+
+
+@dataclass(slots=True)
+class IndexEntry:
+    """One Notion page as known to the local index."""
+
+    page_id: str
+    letterboxd_id: str | None
+    title: str | None
+    fingerprint: str | None
+    tmdb_id: int | None = None
+    backdrop_url: str | None = None
+    synced_at: datetime | None = None  # last time we wrote or refreshed the page
+
+
+class SyncState:
+    """SQLite-backed cache of the letterboxd_id -> page_id index.
+
+    The cache is only trusted when it was written for the same database, with the
+    same schema version, and its last full scan is younger than ``max_age``. Any
+    read error is treated as corruption: the file is discarded so the caller falls
+    back to a full scan of the Notion database.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        database_id: str,
+        max_age: timedelta | None = timedelta(days=7),
+    ):
+        self.path = path
+        self.database_id = database_id
+        self.max_age = max_age
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _discard(self) -> None:
+        """Drop the state file so it is rebuilt from scratch."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def _get_meta(self, key: str) -> str | None:
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._connect().execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def load(self) -> list[IndexEntry] | None:
+        """Load the cached index.
+
+        Returns:
+            Index entries in insertion order, or None if the cache is missing,
+            stale, written for another database, or corrupt
+        """
+        if not self.path.exists():
+            return None
+
+        try:
+            conn = self._connect()
+            if conn.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+                raise sqlite3.DatabaseError("quick_check failed")
+
+            if self._get_meta("schema_version") != SCHEMA_VERSION:
+                return None
+            if self._get_meta("database_id") != self.database_id:
+                return None
+
+            scanned_at = self._get_meta("scanned_at")
+            if scanned_at is None:
+                return None
+            if self.max_age is not None:
+                age = datetime.now(UTC) - datetime.fromisoformat(scanned_at)
+                if age > self.max_age:
+                    return None
+
+            rows = conn.execute(
+                "SELECT page_id, letterboxd_id, title, fingerprint, tmdb_id, backdrop_url, "
+                "synced_at FROM pages ORDER BY rowid"
+            ).fetchall()
+        except (sqlite3.DatabaseError, ValueError):
+            self._discard()
+            return None
+
+        return [IndexEntry(*row[:-1], synced_at=datetime.fromisoformat(row[-1])) for row in rows]
+
+    def get_high_water(self) -> str | None:
+        """Latest Notion ``last_edited_time`` the index has caught up with."""
+        try:
+            return self._get_meta("high_water")
+        except sqlite3.DatabaseError:
+            return None
+
+    def replace(self, entries: list[IndexEntry], high_water: str | None = None) -> None:
+        """Replace the whole index after a full scan of the Notion database.
+
+        Last-synced times of pages that were already known are carried over, the
+        others start now; either way they are set on ``entries`` as well.
+        """
+        previous: dict[str, str] = {}
+        if self.path.exists():
+            try:
+                if self._get_meta("database_id") == self.database_id:
+                    previous = dict(self._connect().execute("SELECT page_id, synced_at FROM pages"))
+            except sqlite3.DatabaseError:
+                pass
+
+        # Start from a fresh file, which also clears corrupt or outdated layouts
+        self._discard()
+        now = datetime.now(UTC)
+        for entry in entries:
+            synced_at = previous.get(entry.page_id)
+            entry.synced_at = datetime.fromisoformat(synced_at) if synced_at else now
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self._row(e, (e.synced_at or now).isoformat()) for e in entries),
+            )
+            self._set_meta("schema_version", SCHEMA_VERSION)
+            self._set_meta("database_id", self.database_id)
+            self._set_meta("scanned_at", now.isoformat())
+            if high_water is not None:
+                self._set_meta("high_water", high_water)
+
+    @staticmethod
+    def _row(entry: IndexEntry, synced_at: str) -> tuple:
+        return (
+            entry.page_id,
+            entry.letterboxd_id,
+            entry.title,
+            entry.fingerprint,
+            entry.tmdb_id,
+            entry.backdrop_url,
+            synced_at,
+        )
+
+    def record(self, entry: IndexEntry) -> None:
+        """Insert or update a single page after it was written."""
+        self.record_many([entry], synced=True)
+
+    def record_many(
+        self,
+        entries: list[IndexEntry],
+        high_water: str | None = None,
+        synced: bool = False,
+    ) -> None:
+        """Insert or update pages, optionally advancing the high-water mark.
+
+        Args:
+            entries: Pages to store
+            high_water: New high-water mark, if any
+            synced: Whether we just wrote these pages (updates their last-synced time)
+        """
+        now = datetime.now(UTC)
+        synced_at = "excluded.synced_at" if synced else "pages.synced_at"
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(page_id) DO UPDATE SET "
+                "letterboxd_id = excluded.letterboxd_id, title = excluded.title, "
+                "fingerprint = excluded.fingerprint, tmdb_id = excluded.tmdb_id, "
+                f"backdrop_url = excluded.backdrop_url, synced_at = {synced_at}",
+                (self._row(e, (e.synced_at or now).isoformat()) for e in entries),
+            )
+            if high_water is not None:
+                self._set_meta("high_water", high_water)
+
+    def remove(self, page_ids: list[str]) -> None:
+        """Drop pages that were archived in Notion."""
+        conn = self._connect()
+        with conn:
+            conn.executemany("DELETE FROM pages WHERE page_id = ?", ((p,) for p in page_ids))
@@ -0,0 +1,87 @@
+"""HTTP clients for Letterboxd, TMDB and Notion, tuned per service.
+
+Every request the sync makes goes through a client built here: one per service,
+kept open for the whole run so concurrent stages reuse warm (keep-alive, and with
+HTTP/2 multiplexed) connections instead of opening new TLS sessions.
+"""
+
+import importlib.util
+import warnings
+from dataclasses import dataclass
+
+import httpx
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceProfile:
+    """Timeouts and connection pool settings for one service."""
+
+    connect: float
+    read: float
+    write: float
+    # Waiting for a free pooled connection; rate limiters already bound the queue
+    pool: float = 60.0
+    keepalive_expiry: float = 30.0
+    follow_redirects: bool = False
+
+
+PROFILES = {
+    # Diary pages come through a CDN and can be slow to render on a cold cache
+    "letterboxd": ServiceProfile(connect=10.0, read=30.0, write=10.0, follow_redirects=True),
+    "tmdb": ServiceProfile(connect=5.0, read=10.0, write=10.0),
+    # Database queries of 100 wide pages regularly take several seconds
+    "notion": ServiceProfile(connect=10.0, read=60.0, write=30.0),
+}
+
+
+def http2_available() -> bool:
+    """Whether the optional HTTP/2 support (the ``h2`` package) is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_client(
+    service: str,
+    connections: int = 10,
+    http2: bool = False,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """Build the client for ``service`` ("letterboxd", "tmdb" or "notion").
+
+    Responses are requested compressed (gzip and deflate, plus brotli/zstd when
+    their packages are installed); httpx decodes them transparently.
+
+    Args:
+        service: Service whose timeouts and pool profile to use
+        connections: Connections kept open to the service; match the number of
+            concurrent requests so none waits for a connection
+        http2: Multiplex requests over HTTP/2 (needs the ``http2`` extra; falls back
+            to HTTP/1.1 with a warning if it isn't installed)
+        transport: Transport to send requests through instead of the network
+    """
+    profile = PROFILES[service]
+    if http2 and transport is None and not http2_available():
+        warnings.warn(
+            "HTTP/2 requested but the h2 package is not installed "
+            "(install letterboxd2notion[http2]); using HTTP/1.1",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        http2 = False
+
+    connections = max(1, connections)
+    return httpx.AsyncClient(
+        http2=http2,
+        transport=transport,
+        timeout=httpx.Timeout(
+            connect=profile.connect,
+            read=profile.read,
+            write=profile.write,
+            pool=profile.pool,
+        ),
+        limits=httpx.Limits(
+            max_connections=connections,
+            max_keepalive_connections=connections,
+            keepalive_expiry=profile.keepalive_expiry,
+        ),
+        follow_redirects=profile.follow_redirects,
+    )
@@ -0,0 +1,49 @@
+"""Shared fixtures: settings on a temporary cache, and the offline fake services."""
+
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+# The fakes are shared with the benchmarks
+sys.path.insert(0, str(Path(__file__).parents[1] / "benchmarks"))
+
+from fakes import DATABASE_ID, USERNAME, FakeServices  # noqa: E402
+
+from letterboxd2notion import transport  # noqa: E402
+from letterboxd2notion.config import get_settings  # noqa: E402
+
+
+@pytest.fixture
+def env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Iterator[Path]:
+    """Settings for the fake account, with the cache in a temporary directory."""
+    for key, value in {
+        "TOKEN_V3": "secret",
+        "DATABASE_ID": DATABASE_ID,
+        "TMDB_API_KEY": "key",
+        "LETTERBOXD_USERNAME": USERNAME,
+        "CACHE_DIR": str(tmp_path / "cache"),
+        "RATE_LIMIT_DELAY": "0",
+        "LETTERBOXD_RATE_LIMIT": "1000",
+        "TMDB_RATE_LIMIT": "1000",
+    }.items():
+        monkeypatch.setenv(key, value)
+    monkeypatch.delenv("METRICS_DIR", raising=False)
+    monkeypatch.delenv("TARGETS_FILE", raising=False)
+    get_settings.cache_clear()
+    yield tmp_path
+    get_settings.cache_clear()
+
+
+@pytest.fixture
+def services(monkeypatch: pytest.MonkeyPatch) -> FakeServices:
+    """Fake Letterboxd, TMDB and Notion behind every client the CLI builds."""
+    fake = FakeServices(entries=30, validators=True)
+    create_client = transport.create_client
+
+    def fake_client(service: str, *args, **kwargs):
+        return create_client(service, *args, **{**kwargs, "transport": fake.transport()})
+
+    monkeypatch.setattr(transport, "create_client", fake_client)
+    return fake
@@ -0,0 +1,139 @@
+"""On-disk caches in front of TMDB and Letterboxd."""
+
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from letterboxd2notion.parsers.cache import HTTPCache, TMDBCache
+
+
+async def test_concurrent_lookups_of_one_key_make_one_request(tmp_path: Path):
+    cache = TMDBCache(tmp_path / "cache.sqlite")
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"id": 1}
+
+    key = TMDBCache.search_key("Paris, Texas", 1984)
+    results = await asyncio.gather(*(cache.get_or_fetch(key, fetch) for _ in range(10)))
+    assert results == [{"id": 1}] * 10
+    assert calls == 1
+    assert (cache.misses, cache.hits) == (1, 9)
+
+    # Titles differing only in case and spacing share the entry
+    assert await cache.get_or_fetch(TMDBCache.search_key("paris,  TEXAS", 1984), fetch) == {"id": 1}
+    assert calls == 1
+    cache.close()
+
+
+async def test_errors_reach_every_waiter_and_are_not_cached():
+    cache = TMDBCache()
+    calls = 0
+
+    async def fail():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("TMDB is down")
+
+    results = await asyncio.gather(
+        *(cache.get_or_fetch("movie:1", fail) for _ in range(3)), return_exceptions=True
+    )
+    assert calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def fetch():
+        return {"id": 1}
+
+    assert await cache.get_or_fetch("movie:1", fetch) == {"id": 1}
+
+
+async def test_cancelled_request_lets_waiters_retry():
+    cache = TMDBCache()
+    started = asyncio.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.sleep(10)
+
+    async def fetch():
+        return {"id": 1}
+
+    first = asyncio.create_task(cache.get_or_fetch("movie:1", hang))
+    await started.wait()
+    waiter = asyncio.create_task(cache.get_or_fetch("movie:1", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert await waiter == {"id": 1}
+
+
+async def test_negative_results_are_cached():
+    cache = TMDBCache()
+    calls = 0
+
+    async def no_results():
+        nonlocal calls
+        calls += 1
+        return None
+
+    for _ in range(2):
+        assert await cache.get_or_fetch("search:nothing:", no_results) is None
+    assert calls == 1
+
+
+URL = "https://letterboxd.com/user/rss/"
+
+
+def _feed_client(requests: list[httpx.Request]) -> httpx.AsyncClient:
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"v1"'}, content=b"<rss/>")
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handle))
+
+
+@pytest.mark.parametrize("drop", [HTTPCache.discard, HTTPCache.close])
+async def test_uncommitted_validators_are_not_persisted(tmp_path: Path, drop):
+    requests: list[httpx.Request] = []
+    cache = HTTPCache(tmp_path / "http.sqlite")
+    async with _feed_client(requests) as client:
+        await cache.get(client, URL)
+        # Staged responses are visible within the run
+        assert cache.lookup(URL) is not None
+        drop(cache)
+        cache.close()
+
+        cache = HTTPCache(tmp_path / "http.sqlite")
+        assert cache.lookup(URL) is None
+        assert (await cache.get(client, URL)).status_code == 200
+    assert "If-None-Match" not in requests[-1].headers
+    cache.close()
+
+
+async def test_committed_response_is_revalidated(tmp_path: Path):
+    requests: list[httpx.Request] = []
+    cache = HTTPCache(tmp_path / "http.sqlite")
+    async with _feed_client(requests) as client:
+        await cache.get(client, URL)
+        cache.commit()
+        cache.close()
+
+        cache = HTTPCache(tmp_path / "http.sqlite")
+        response = await cache.get(client, URL)
+    assert requests[-1].headers["If-None-Match"] == '"v1"'
+    assert response.status_code == 304
+    assert response.content == b"<rss/>"
+    assert cache.revalidated == 1
+    # The count is per run: a long-running watch starts each poll from zero
+    cache.commit()
+    assert cache.revalidated == 0
+    cache.close()
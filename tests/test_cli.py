@@ -0,0 +1,65 @@
+"""End-to-end CLI runs against the fake services."""
+
+import httpx
+from click.testing import CliRunner
+
+from letterboxd2notion.cli import main
+
+
+def run(*args: str):
+    result = CliRunner().invoke(main, list(args))
+    assert result.exception is None or isinstance(result.exception, SystemExit), result.output
+    return result
+
+
+def test_dry_run_leaves_the_feed_for_the_next_sync(env, services):
+    dry = run("sync", "--dry-run")
+    assert dry.exit_code == 0, dry.output
+    assert "Dry run - would sync" in dry.output
+    assert services.notion_pages == 0
+
+    # The dry run must not have stored the feed's validators
+    real = run("sync")
+    assert real.exit_code == 0, real.output
+    assert "RSS feed unchanged" not in real.output
+    assert services.notion_pages == services.entries
+
+    again = run("sync")
+    assert "RSS feed unchanged since the last sync" in again.output
+
+
+def test_reconcile_refuses_to_archive_above_the_threshold(env, services):
+    assert run("sync", "--full").exit_code == 0
+    # Two thirds of the diary gone: more likely a short scrape than real deletions
+    services.entries = 10
+    refused = run("reconcile")
+    assert refused.exit_code == 1
+    assert "Refusing to archive 20 of 30 pages" in refused.output
+    assert services.notion_pages == 30
+
+    forced = run("reconcile", "--force")
+    assert forced.exit_code == 0, forced.output
+    assert "Reconcile complete: 20 archived" in forced.output
+    assert services.notion_pages == 10
+
+
+def test_reconcile_keeps_entries_the_second_scrape_finds(env, services):
+    assert run("sync", "--full").exit_code == 0
+    handle = services.handle
+    first_pages = 0
+
+    async def shifting_handle(request: httpx.Request) -> httpx.Response:
+        nonlocal first_pages
+        if request.url.path.endswith("/films/diary/page/1/"):
+            first_pages += 1
+            # The first scrape misses two entries, as if rows had shifted mid-scrape
+            services.entries = 28 if first_pages == 1 else 30
+        return await handle(request)
+
+    services.handle = shifting_handle
+    result = run("reconcile")
+    assert result.exit_code == 0, result.output
+    assert "2 pages have no diary entry on Letterboxd" in result.output
+    assert result.output.count("[kept]") == 2
+    assert "Nothing to archive" in result.output
+    assert services.notion_pages == 30
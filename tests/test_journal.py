@@ -0,0 +1,81 @@
+"""Resuming an interrupted full sync from its progress journal."""
+
+from collections import Counter
+from pathlib import Path
+
+import httpx
+from click.testing import CliRunner
+from fakes import DATABASE_ID, DIARY_URL
+
+from letterboxd2notion.cli import main
+from letterboxd2notion.exceptions import NotionError
+from letterboxd2notion.journal import SyncJournal
+from letterboxd2notion.models import Film
+
+DIARY_PATH = httpx.URL(DIARY_URL).path
+
+
+def test_resume_skips_journaled_pages_and_written_films(env, services):
+    services.entries = 120
+    handle = services.handle
+    paths: Counter[str] = Counter()
+    creates_left = 40
+
+    async def failing_handle(request: httpx.Request) -> httpx.Response:
+        nonlocal creates_left
+        paths[request.url.path] += 1
+        if request.method == "POST" and request.url.path == "/v1/pages":
+            if creates_left == 0:
+                return httpx.Response(400, json={"message": "validation_error"})
+            creates_left -= 1
+        return await handle(request)
+
+    services.handle = failing_handle
+    interrupted = CliRunner().invoke(main, ["sync", "--full"])
+    assert isinstance(interrupted.exception, NotionError)
+    written = services.notion_pages
+    assert 0 < written < services.entries
+    journal = SyncJournal(env / "cache" / f"journal-{DATABASE_ID}.sqlite", DATABASE_ID)
+    assert journal.start(resume=True)
+    scraped = [page for page in range(1, 4) if journal.page(page) is not None]
+    journal.close()
+    assert scraped
+
+    paths.clear()
+    creates_left = -1
+    resumed = CliRunner().invoke(main, ["sync", "--full", "--resume"])
+    assert resumed.exit_code == 0, resumed.output
+    assert "Resuming:" in resumed.output
+    assert f"{written} written before resuming" in resumed.output
+    # Every film has exactly one page, and journaled diary pages aren't scraped again
+    assert services.notion_pages == services.entries
+    assert paths["/v1/pages"] == services.entries - written
+    assert not any(paths[f"{DIARY_PATH}/page/{page}/"] for page in scraped)
+    assert not journal.path.exists()
+
+
+def test_journal_of_another_database_is_not_resumed(tmp_path: Path):
+    path = tmp_path / "journal.sqlite"
+    film = Film(
+        letterboxd_id="letterboxd-viewing-1",
+        title="Film",
+        year=2000,
+        letterboxd_url="https://letterboxd.com/film/film/",
+    )
+    journal = SyncJournal(path, "db")
+    assert not journal.start()
+    journal.record_page(1, [film], page_count=3)
+    journal.record_written(film.letterboxd_id, "page-1", "created")
+    journal.close()
+
+    journal = SyncJournal(path, "db")
+    assert journal.start(resume=True)
+    assert journal.page(1) == ([film], 3)
+    assert journal.written(film.letterboxd_id) == "page-1"
+    journal.close()
+
+    other = SyncJournal(path, "other-db")
+    assert not other.start(resume=True)
+    assert other.page(1) is None
+    other.finish()
+    assert not path.exists()
@@ -0,0 +1,92 @@
+"""Streaming scrape -> enrich -> write pipeline."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+
+from letterboxd2notion.models import Film
+from letterboxd2notion.pipeline import run_pipeline
+
+
+def film(n: int) -> Film:
+    return Film(
+        letterboxd_id=f"letterboxd-viewing-{n}",
+        title=f"Film {n}",
+        year=2000,
+        letterboxd_url=f"https://letterboxd.com/film/film-{n}/",
+    )
+
+
+class Source:
+    """Films 0..count-1, recording how far it was consumed and whether it was closed."""
+
+    def __init__(self, count: int):
+        self.count = count
+        self.yielded = 0
+        self.closed = False
+
+    async def __call__(self) -> AsyncIterator[Film]:
+        try:
+            for n in range(self.count):
+                self.yielded += 1
+                yield film(n)
+        finally:
+            self.closed = True
+
+
+async def enrich(f: Film) -> Film:
+    return f.model_copy(update={"poster_url": "https://image.tmdb.org/poster.jpg"})
+
+
+async def test_every_film_is_enriched_and_written():
+    source = Source(100)
+    written: list[Film] = []
+
+    async def write(f: Film) -> str:
+        written.append(f)
+        return "created" if int(f.letterboxd_id.rsplit("-", 1)[1]) % 2 else "skipped"
+
+    counts = await run_pipeline(source(), enrich, write, queue_size=4)
+    assert counts == {"created": 50, "updated": 0, "skipped": 50}
+    assert len(written) == 100
+    assert all(f.poster_url for f in written)
+    assert source.closed
+
+
+async def test_limit_stops_the_source():
+    source = Source(100)
+
+    async def write(f: Film) -> str:
+        return "created"
+
+    counts = await run_pipeline(source(), enrich, write, limit=10)
+    assert counts["created"] == 10
+    assert source.yielded == 10
+    assert source.closed
+
+
+async def test_failure_propagates_and_cancels_the_other_stages():
+    source = Source(1000)
+    cancelled = 0
+
+    async def slow_enrich(f: Film) -> Film:
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(0 if f.letterboxd_id.endswith("-0") else 10)
+        except asyncio.CancelledError:
+            cancelled += 1
+            raise
+        return f
+
+    async def write(f: Film) -> str:
+        raise ValueError(f"cannot write {f.title}")
+
+    # The first failure comes out as is, not wrapped in an ExceptionGroup
+    with pytest.raises(ValueError, match="cannot write Film 0"):
+        await run_pipeline(source(), slow_enrich, write, enrich_concurrency=4, queue_size=8)
+    # Every enricher was stuck on a later film
+    assert cancelled == 4
+    assert source.closed
+    # The bounded queues kept the source from running ahead
+    assert source.yielded < 20
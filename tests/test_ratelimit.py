@@ -0,0 +1,120 @@
+"""Adaptive token bucket and the retries built on top of it."""
+
+import time
+
+import httpx
+import pytest
+
+from letterboxd2notion.exceptions import NotionError, ParseError
+from letterboxd2notion.notion.client import NotionClient
+from letterboxd2notion.parsers import html_parser
+from letterboxd2notion.ratelimit import TokenBucket, parse_retry_after, rate_for_delay
+
+
+def test_throttle_halves_the_rate_down_to_the_floor():
+    bucket = TokenBucket(10, capacity=3)
+    bucket.on_throttle()
+    assert bucket.rate == 5
+    for _ in range(10):
+        bucket.on_throttle()
+    assert bucket.rate == bucket.min_rate == 1
+
+
+def test_success_recovers_the_rate_up_to_the_ceiling():
+    bucket = TokenBucket(10, capacity=3)
+    bucket.on_throttle()
+    bucket.on_success()
+    assert bucket.rate == pytest.approx(5.5)
+    for _ in range(100):
+        bucket.on_success()
+    assert bucket.rate == bucket.max_rate == 10
+
+
+async def test_burst_goes_out_at_once_then_the_rate_applies():
+    bucket = TokenBucket(20, capacity=3)
+    waits = [await bucket.acquire() for _ in range(3)]
+    assert max(waits) < 0.01
+    # The fourth token takes 1 / rate to refill
+    assert await bucket.acquire() == pytest.approx(0.05, abs=0.03)
+
+
+async def test_throttle_pauses_every_caller_for_retry_after():
+    bucket = TokenBucket(1000, capacity=10)
+    bucket.on_throttle(retry_after=0.1)
+    assert await bucket.acquire() >= 0.09
+
+
+async def test_zero_delay_means_no_limit():
+    bucket = TokenBucket(rate_for_delay(0), capacity=1)
+    start = time.monotonic()
+    for _ in range(1000):
+        await bucket.acquire()
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.parametrize(
+    ("header", "seconds"), [("2", 2.0), ("0.5", 0.5), ("-1", 0.0), ("Wed, 21 Oct", None)]
+)
+def test_parse_retry_after(header, seconds):
+    assert parse_retry_after(header) == seconds
+
+
+def _client(responses: list[httpx.Response], requests: list[httpx.Request]) -> NotionClient:
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return responses.pop(0)
+
+    return NotionClient(
+        "token", rate_limit_delay=0.001, burst=10, transport=httpx.MockTransport(handle)
+    )
+
+
+async def test_429_slows_the_shared_limiter_and_is_retried():
+    requests: list[httpx.Request] = []
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0.05"}),
+        httpx.Response(200, json={"ok": True}),
+    ]
+    async with _client(responses, requests) as client:
+        rate = client.limiter.rate
+        assert await client.get_database("db") == {"ok": True}
+        # One success added back a step, far from undoing the halving
+        assert client.limiter.rate < rate
+    assert len(requests) == 2
+
+
+async def test_5xx_waits_for_its_retry_after():
+    requests: list[httpx.Request] = []
+    responses = [
+        httpx.Response(503, headers={"Retry-After": "0.1"}),
+        httpx.Response(200, json={}),
+    ]
+    async with _client(responses, requests) as client:
+        start = time.monotonic()
+        await client.get_database("db")
+        assert time.monotonic() - start >= 0.09
+        # Only a 429 concerns the rate limit
+        assert client.limiter.rate == client.limiter.max_rate
+
+
+async def test_create_is_not_replayed_after_a_5xx():
+    requests: list[httpx.Request] = []
+    responses = [httpx.Response(502), httpx.Response(200, json={"id": "page"})]
+    async with _client(responses, requests) as client:
+        with pytest.raises(NotionError) as error:
+            await client.create_page("db", {})
+    assert error.value.status == 502
+    assert len(requests) == 1
+
+
+async def test_diary_fetch_backs_off_only_between_attempts(monkeypatch):
+    delays: list[int] = []
+    monkeypatch.setattr(html_parser, "backoff_delay", lambda attempt: delays.append(attempt) or 0)
+    transport = httpx.MockTransport(lambda request: httpx.Response(503))
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(ParseError, match="diary page 1"):
+            await html_parser._fetch_with_retries(
+                client, "https://letterboxd.com/", TokenBucket(1000), 2, what="diary page 1"
+            )
+    # No pointless wait after the last attempt
+    assert delays == [0, 1]
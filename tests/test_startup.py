@@ -0,0 +1,40 @@
+"""CLI startup stays within its import-time budget and loads no sync-only modules.
+
+Each case runs ``python -X importtime -m letterboxd2notion ...`` in a subprocess, as
+``make check-startup`` does.
+"""
+
+import pytest
+from bench_startup import HEAVY_MODULES, import_times, package_import_ms
+
+BUDGET_MS = 60
+RUNS = 5
+
+# Package modules that only commands talking to the services need
+SYNC_MODULES = (
+    "letterboxd2notion.notion.client",
+    "letterboxd2notion.notion.sync",
+    "letterboxd2notion.parsers.html_parser",
+    "letterboxd2notion.parsers.rss_parser",
+    "letterboxd2notion.parsers.tmdb",
+    "letterboxd2notion.models",
+    "letterboxd2notion.config",
+)
+
+
+@pytest.mark.parametrize(
+    "command",
+    [["--help"], ["sync", "--help"], ["watch", "--help"], ["reconcile", "--help"]],
+    ids=" ".join,
+)
+def test_help_imports_no_heavy_modules(command: list[str]) -> None:
+    names = {name for name, _, _ in import_times(command)}
+    heavy = sorted(n for n in names if n.split(".")[0] in HEAVY_MODULES)
+    assert not heavy
+    assert not names & set(SYNC_MODULES)
+
+
+def test_help_within_import_budget() -> None:
+    # The fastest of a few runs, so a busy machine doesn't fail the check
+    best = min(package_import_ms(import_times(["--help"])) for _ in range(RUNS))
+    assert best <= BUDGET_MS, f"imports took {best:.1f} ms, over the {BUDGET_MS} ms budget"
@@ -0,0 +1,94 @@
+"""Local index cache: trusted only when intact, current and for the same database."""
+
+import sqlite3
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from fakes import DATABASE_ID, FakeServices
+
+from letterboxd2notion.notion.client import NotionClient
+from letterboxd2notion.notion.sync import NotionSync
+from letterboxd2notion.state import IndexEntry, SyncState
+
+
+def entries(count: int) -> list[IndexEntry]:
+    return [
+        IndexEntry(f"page-{n}", f"letterboxd-viewing-{n}", f"Film {n}", f"digest-{n}")
+        for n in range(count)
+    ]
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    return tmp_path / "index.sqlite"
+
+
+def test_round_trip(path):
+    state = SyncState(path, DATABASE_ID)
+    state.replace(entries(3), high_water="2025-01-01T00:00:00.000Z")
+    state.close()
+
+    state = SyncState(path, DATABASE_ID)
+    loaded = state.load()
+    assert [e.page_id for e in loaded] == ["page-0", "page-1", "page-2"]
+    assert all(e.synced_at is not None for e in loaded)
+    assert state.get_high_water() == "2025-01-01T00:00:00.000Z"
+
+
+def test_corrupt_file_is_discarded(path):
+    path.write_bytes(b"definitely not sqlite" * 100)
+    assert SyncState(path, DATABASE_ID).load() is None
+    assert not path.exists()
+
+
+def test_old_schema_is_not_trusted(path):
+    state = SyncState(path, DATABASE_ID)
+    state.replace(entries(1))
+    state.close()
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE meta SET value = '1' WHERE key = 'schema_version'")
+    conn.close()
+    assert SyncState(path, DATABASE_ID).load() is None
+
+
+def test_other_database_is_not_trusted(path):
+    SyncState(path, DATABASE_ID).replace(entries(1))
+    assert SyncState(path, "another-database").load() is None
+
+
+def test_stale_index_is_not_trusted(path):
+    SyncState(path, DATABASE_ID).replace(entries(1))
+    assert SyncState(path, DATABASE_ID, max_age=timedelta(0)).load() is None
+    assert SyncState(path, DATABASE_ID, max_age=None).load() is not None
+
+
+def test_remove_drops_archived_pages(path):
+    state = SyncState(path, DATABASE_ID)
+    state.replace(entries(3))
+    state.remove(["page-1"])
+    assert [e.page_id for e in state.load()] == ["page-0", "page-2"]
+
+
+async def _initialize(fake: FakeServices, path: Path) -> NotionSync:
+    async with NotionClient("token", rate_limit_delay=0, transport=fake.transport()) as client:
+        sync = NotionSync(client, DATABASE_ID, state=SyncState(path, DATABASE_ID))
+        await sync.initialize(delta=False)
+        sync.state.close()
+        return sync
+
+
+async def test_unusable_index_is_rebuilt_from_notion(path):
+    fake = FakeServices(entries=10, existing=10)
+    first = await _initialize(fake, path)
+    assert (first.index_source, first.existing_count) == ("notion", 10)
+
+    fake.requests.clear()
+    cached = await _initialize(fake, path)
+    assert (cached.index_source, cached.existing_count) == ("cache", 10)
+    assert fake.requests["notion"] == 0
+
+    path.write_bytes(b"corrupted")
+    rebuilt = await _initialize(fake, path)
+    assert (rebuilt.index_source, rebuilt.existing_count) == ("notion", 10)
+    assert SyncState(path, DATABASE_ID).load() is not None
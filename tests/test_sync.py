@@ -0,0 +1,27 @@
+"""Upserts into the Notion database."""
+
+import asyncio
+
+from fakes import DATABASE_ID, FakeServices
+
+from letterboxd2notion.models import Film
+from letterboxd2notion.notion.client import NotionClient
+from letterboxd2notion.notion.sync import NotionSync
+
+
+async def test_concurrent_writes_of_one_film_create_one_page():
+    fake = FakeServices(entries=0)
+    film = Film(
+        letterboxd_id="letterboxd-viewing-1",
+        title="Paris, Texas",
+        year=1984,
+        letterboxd_url="https://letterboxd.com/film/paris-texas/",
+    )
+    async with NotionClient("token", rate_limit_delay=0, transport=fake.transport()) as client:
+        sync = NotionSync(client, DATABASE_ID)
+        await sync.initialize()
+        results = await asyncio.gather(*(sync.sync_film(film) for _ in range(5)))
+    assert sorted(action for _, action in results) == ["created"] + ["skipped"] * 4
+    assert fake.notion_pages == 1
+    # Locks don't outlive the writes, however many titles a watch goes through
+    assert len(sync._title_locks) == 0